@@ -9,13 +9,12 @@ sys.path.append(str(Path(__file__).resolve().parents[1] / "app"))
 
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
-from sqlalchemy import pool
+from sqlalchemy import engine_from_config, pool
 
 from alembic import context
-
-from app.models.tag import Tag  # type: ignore
 from app.db import Base
+from app.models.tag import Tag  # noqa: F401 - registers the table on Base.metadata
+
 
 # At the top of alembic/env.py, after imports
 def get_url():
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import hmac
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import (
+    SessionLocal,
+    async_pool_stats,
+    get_db,
+    replica_pool_stats,
+    sync_pool_stats,
+)
+from app.models.tag import TaxonomyVersion
+from app.services import export, suggest_cache, synonyms, tag_cache, tag_events
+
+
+def require_admin(request: Request) -> None:
+    token = request.headers.get("X-Admin-Token")
+    expected = settings.admin_token
+    if not expected or not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+
+
+router = APIRouter(prefix="/api/v1/admin", dependencies=[Depends(require_admin)])
+
+
+@router.get("/cache/suggest")
+def suggest_cache_stats() -> dict:
+    return suggest_cache.cache.stats()
+
+
+@router.get("/cache/tags")
+def tag_cache_stats() -> dict:
+    return {**tag_cache.cache.stats(), "events": tag_events.stats()}
+
+
+@router.get("/pool")
+def pool_stats() -> dict:
+    """Pool usage for this worker.
+
+    Rising ``wait_ms`` and ``timeouts`` with ``checked_out`` at the pool
+    limit mean starvation; rising ``held_ms`` alone means slow queries.
+    """
+    return {
+        "settings": {
+            "pool_size": settings.db_pool_size,
+            "max_overflow": settings.db_max_overflow,
+            "pool_timeout": settings.db_pool_timeout,
+            "pool_recycle": settings.db_pool_recycle,
+            "pool_pre_ping": settings.db_pool_pre_ping,
+            "statement_timeout_ms": settings.db_statement_timeout_ms,
+        },
+        "sync": sync_pool_stats.stats(),
+        "async": async_pool_stats.stats(),
+        "replica": replica_pool_stats.stats() if settings.database_replica_url else None,
+    }
+
+
+@router.get("/taxonomy")
+def taxonomy_version(db: Session = Depends(get_db)) -> dict:
+    """Version written by scripts/seed_tags.py; changes whenever seeded content does."""
+    row = db.execute(select(TaxonomyVersion)).scalar_one_or_none()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_seeded")
+    return {"version": row.version, "tags": row.tags, "applied_at": row.applied_at}
+
+
+@router.post("/synonyms/reload")
+def reload_synonyms(force: bool = Query(False)) -> dict:
+    # Reloads this worker only; other workers pick the file up through
+    # their watcher (SYNONYMS_WATCH_INTERVAL).
+    try:
+        changed = synonyms.reload(force=force)
+    except (OSError, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invalid_synonyms") from None
+    state = synonyms.state()
+    return {"changed": changed, "version": state.version, "keys": len(state.mapping), "digest": state.digest}
+
+
+@router.get("/export/children.ndjson")
+def export_children(since: datetime | None = Query(None)) -> StreamingResponse:
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not configured.")
+
+    def body():
+        # Own session: the request-scoped one may be closed before the
+        # stream is drained.
+        with SessionLocal() as session:
+            yield from export.iter_ndjson(session, since)
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
@@ -1,14 +1,12 @@
 from __future__ import annotations
 
-import uuid
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.db import get_db
+from app.core.db import get_async_db, note_write
 from app.models.child import ChildProfile
 from app.schemas.child import ChildCreateIn, ChildOut
 
-
 router = APIRouter(prefix="/api/v1")
 
 
@@ -20,9 +18,10 @@ def get_current_user_id(request: Request) -> str:
 
 
 @router.post("/children", response_model=ChildOut)
-def create_child(
+async def create_child(
     body: ChildCreateIn,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id),
 ) -> ChildOut:
     c = ChildProfile(
@@ -34,8 +33,9 @@ def create_child(
         language_pref=body.language_pref,
     )
     db.add(c)
-    db.commit()
-    db.refresh(c)
+    await db.commit()
+    note_write(response)
+    await db.refresh(c)
     return ChildOut(
         id=str(c.id),
         name=c.name,
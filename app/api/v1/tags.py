@@ -1,21 +1,32 @@
 from __future__ import annotations
 
 import uuid
-from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy.orm import Session
+from fastapi.responses import Response
 from sqlalchemy import select
-
-from app.core.db import get_db
-from app.models.child import ChildProfile
-from app.models.tag import ChildTag, Tag
-from app.schemas.tags import ChildTagsIn, ChildTagsOut, TagOut
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import responses
+from app.core.config import settings
+from app.core.db import get_async_db, get_async_read_db, note_write
+from app.models.child import ChildProfile, coerce_user_id
+from app.schemas.tags import (
+    ChildrenTagsIn,
+    ChildrenTagsOut,
+    ChildTagsIn,
+    ChildTagsOut,
+    ExtractIn,
+    SuggestBatchIn,
+    TagOut,
+)
 from app.services import tagging as tagging_service
 
-
 router = APIRouter(prefix="/api/v1")
 
+# Children per bulk tag read; reads are the hot path and stay small.
+MAX_BULK_READ_CHILDREN = 100
+
 
 def get_current_user_id(request: Request) -> str:
     user_id = request.headers.get("X-User-Id")
@@ -24,65 +35,193 @@ def get_current_user_id(request: Request) -> str:
     return user_id
 
 
-def assert_child_owned(db: Session, child_id: str, user_id: str) -> ChildProfile:
+async def assert_child_owned(db: AsyncSession, child_id: str, user_id: str) -> ChildProfile:
     try:
         cid = uuid.UUID(str(child_id))
-    except Exception:
+    except ValueError:
         # child_id path param invalid
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found") from None
 
-    child = db.get(ChildProfile, cid)
+    child = await db.get(ChildProfile, cid)
     if child is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
 
-    if str(child.user_id) != str(user_id):
+    if child.user_id != coerce_user_id(user_id):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
 
     return child
 
 
+def _child_tags_out(child_id: str, tags: list[dict]) -> ChildTagsOut | Response:
+    # Service output is already in ChildTagsOut shape; with FAST_JSON it is
+    # encoded directly instead of being validated again by response_model.
+    if settings.fast_json:
+        return responses.RawJSONResponse(responses.child_tags_json(child_id, tags))
+    return ChildTagsOut(child_id=child_id, tags=[TagOut(**t) for t in tags], suggestions=[])
+
+
+@router.get("/children/tags", response_model=ChildrenTagsOut)
+async def get_children_tags(
+    ids: list[str] = Query(...),
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: str = Depends(get_current_user_id),
+) -> ChildrenTagsOut | Response:
+    # Accepts ?ids=a&ids=b as well as ?ids=a,b
+    child_ids: dict[uuid.UUID, None] = {}
+    for part in (p.strip() for raw in ids for p in raw.split(",")):
+        if not part:
+            continue
+        try:
+            child_ids[uuid.UUID(part)] = None
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found") from None
+    if not child_ids:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invalid_request")
+    if len(child_ids) > MAX_BULK_READ_CHILDREN:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="too_many_children")
+
+    found = await tagging_service.children_get_tags_async(db, child_ids)
+    if any(cid not in found for cid in child_ids):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
+    owner = coerce_user_id(user_id)
+    if any(found[cid][0] != owner for cid in child_ids):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+
+    if settings.fast_json:
+        body = b",".join(responses.child_tags_json(str(cid), found[cid][1]) for cid in child_ids)
+        return responses.RawJSONResponse(b'{"children":[%s]}' % body)
+    return ChildrenTagsOut(children=[_child_tags_out(str(cid), found[cid][1]) for cid in child_ids])
+
+
+@router.put("/children/tags")
+async def put_children_tags(
+    body: ChildrenTagsIn,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user_id),
+):
+    # ChildrenTagsIn caps the body at MAX_BULK_WRITE_CHILDREN children
+    parsed: dict[str, uuid.UUID | None] = {}
+    for raw in body.children:
+        try:
+            parsed[raw] = uuid.UUID(raw)
+        except ValueError:
+            parsed[raw] = None
+    owners = dict(
+        (
+            await db.execute(
+                select(ChildProfile.id, ChildProfile.user_id).where(
+                    ChildProfile.id.in_({cid for cid in parsed.values() if cid is not None})
+                )
+            )
+        ).all()
+    )
+    owner = coerce_user_id(user_id)
+    errors: dict[str, str] = {}
+    assignments: dict[uuid.UUID, list[str]] = {}
+    for raw, cid in parsed.items():
+        if cid is None or cid not in owners:
+            errors[raw] = "not_found"
+        elif owners[cid] != owner:
+            errors[raw] = "forbidden"
+        else:
+            assignments[cid] = body.children[raw]
+
+    written = await tagging_service.children_set_tags_async(db, assignments) if assignments else {}
+    await db.commit()
+
+    results = []
+    for raw, cid in parsed.items():
+        if raw in errors:
+            results.append({"child_id": raw, "error": errors[raw]})
+        else:
+            results.append({"child_id": str(cid), "tags": written[cid]})
+    if settings.fast_json:
+        out = responses.FastJSONResponse({"results": results})
+        note_write(out)
+        return out
+    note_write(response)
+    return {"results": results}
+
+
 @router.get("/children/{child_id}/tags", response_model=ChildTagsOut)
-def get_child_tags(
+async def get_child_tags(
     child_id: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     user_id: str = Depends(get_current_user_id),
-) -> ChildTagsOut:
-    assert_child_owned(db, child_id, user_id)
+) -> ChildTagsOut | Response:
+    try:
+        cid = uuid.UUID(child_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found") from None
 
-    # Fetch current tags
-    rows = (
-        db.execute(
-            select(Tag).join(ChildTag, ChildTag.tag_id == Tag.id).where(ChildTag.child_id == uuid.UUID(child_id))
-        )
-        .scalars()
-        .all()
-    )
-    tags = [TagOut(slug=t.slug, label=t.label, category=None) for t in rows]
-    return ChildTagsOut(child_id=str(child_id), tags=tags, suggestions=[])
+    found = await tagging_service.owned_child_tags_async(db, cid, user_id)
+    if found is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="not_found")
+    owned, tags = found
+    if not owned:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="forbidden")
+    return _child_tags_out(child_id, tags)
 
 
 @router.put("/children/{child_id}/tags", response_model=ChildTagsOut)
-def put_child_tags(
+async def put_child_tags(
     child_id: str,
     body: ChildTagsIn,
-    db: Session = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user_id),
-) -> ChildTagsOut:
-    assert_child_owned(db, child_id, user_id)
+) -> ChildTagsOut | Response:
+    await assert_child_owned(db, child_id, user_id)
 
-    normalized = tagging_service.child_set_tags(db, child_id, body.tags)
-    tags = [TagOut(**t) for t in normalized]
-    return ChildTagsOut(child_id=str(child_id), tags=tags, suggestions=[])
+    normalized = await tagging_service.child_set_tags_async(db, child_id, body.tags)
+    await db.commit()
+    out = _child_tags_out(child_id, normalized)
+    # A returned Response does not pick up cookies set on the injected one
+    note_write(out if isinstance(out, Response) else response)
+    return out
 
 
 @router.get("/tags/suggest")
-def suggest(
+async def suggest(
     q: str = Query(...),
     limit: int = Query(8, ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     try:
-        results = tagging_service.suggest_from_text(db, q, limit)
+        results = await tagging_service.suggest_from_text_async(db, q, limit)
     except ValueError:
-        raise HTTPException(status_code=400, detail="invalid_query")
+        raise HTTPException(status_code=400, detail="invalid_query") from None
+    if settings.fast_json:
+        return responses.RawJSONResponse(
+            b'{"query":%s,"results":%s}' % (responses.dumps(q), responses.tags_json(results))
+        )
     return {"query": q, "results": results}
+
+
+@router.post("/tags/suggest:batch")
+async def suggest_batch(
+    body: SuggestBatchIn,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    results = await tagging_service.suggest_batch_async(
+        db, [(item.q, item.limit, item.category) for item in body.queries]
+    )
+    out = []
+    for item, found in zip(body.queries, results, strict=True):
+        if found is None:
+            out.append({"query": item.q, "error": "invalid_query"})
+        else:
+            out.append({"query": item.q, "results": found})
+    if settings.fast_json:
+        return responses.FastJSONResponse({"results": out})
+    return {"results": out}
+
+
+@router.post("/tags/extract")
+async def extract_tags(
+    body: ExtractIn,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    found = await tagging_service.extract_from_text_async(db, body.text)
+    return responses.FastJSONResponse(found) if settings.fast_json else found
@@ -3,7 +3,6 @@ from dataclasses import dataclass
 
 from dotenv import load_dotenv
 
-
 load_dotenv()
 
 
@@ -12,6 +11,56 @@ class Settings:
     environment: str = os.getenv("ENVIRONMENT", "local")
     secret_key: str = os.getenv("SECRET_KEY", "dev-secret-key")
     database_url: str | None = os.getenv("DATABASE_URL")
+    # Async routes connect through asyncpg; defaults to DATABASE_URL with the
+    # driver swapped.
+    database_async_url: str | None = os.getenv("DATABASE_ASYNC_URL")
+    # Connection pool per engine (sync, and async per event loop): pool_size
+    # connections kept open plus up to max_overflow more under load; a
+    # checkout waits pool_timeout seconds before failing. Connections older
+    # than pool_recycle seconds are replaced, and pre-ping tests each one on
+    # checkout so a restarted database does not fail the next request.
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_pool_recycle: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    db_pool_pre_ping: bool = os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false", "no")
+    # Server-side statement_timeout for every pooled connection; 0 disables it.
+    db_statement_timeout_ms: int = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+    # Optional read replica for read-only routes (suggest, child tag reads).
+    # Clients that wrote within the read-your-writes window (a last_write
+    # cookie) read from the primary; after a failed replica connection the
+    # primary serves reads for replica_retry_interval seconds.
+    database_replica_url: str | None = os.getenv("DATABASE_REPLICA_URL")
+    replica_read_your_writes_seconds: float = float(os.getenv("REPLICA_READ_YOUR_WRITES_SECONDS", "5"))
+    replica_retry_interval: float = float(os.getenv("REPLICA_RETRY_INTERVAL", "30"))
+    replica_connect_timeout: float = float(os.getenv("REPLICA_CONNECT_TIMEOUT", "2"))
+    # "memory" serves suggestions from the in-process index; "trgm" queries
+    # Postgres through the pg_trgm GIN index on lower(tag.label).
+    suggest_mode: str = os.getenv("SUGGEST_MODE", "memory")
+    # Seconds before the in-memory suggest index is rebuilt even without a
+    # change notification (listener disabled or disconnected).
+    suggest_index_max_age: float = float(os.getenv("SUGGEST_INDEX_MAX_AGE", "60"))
+    # Seconds the background builder waits after a change before rebuilding,
+    # so a burst of catalog writes costs one rebuild.
+    suggest_index_rebuild_debounce: float = float(os.getenv("SUGGEST_INDEX_REBUILD_DEBOUNCE", "0.5"))
+    # Minimum seconds between rebuilds that only pick up new custom tags,
+    # which users create while tagging children.
+    suggest_index_custom_rebuild_interval: float = float(os.getenv("SUGGEST_INDEX_CUSTOM_REBUILD_INTERVAL", "60"))
+    # Suggest result cache keyed on (normalized query, limit); size 0 disables it.
+    suggest_cache_size: int = int(os.getenv("SUGGEST_CACHE_SIZE", "4096"))
+    suggest_cache_ttl: float = float(os.getenv("SUGGEST_CACHE_TTL", "30"))
+    # LISTEN for tag catalog NOTIFYs so every worker drops cached tags as soon
+    # as another process commits a change.
+    tag_events_listen: bool = os.getenv("TAG_EVENTS_LISTEN", "1").lower() not in ("0", "false", "no")
+    # Seconds between checks of taxonomy/synonyms.json for changes; 0 disables
+    # the watcher (POST /api/v1/admin/synonyms/reload still works).
+    synonyms_watch_interval: float = float(os.getenv("SYNONYMS_WATCH_INTERVAL", "5"))
+    # Encode tag API responses with orjson (stdlib json without it), skip the
+    # response_model re-validation of service output and reuse encoded
+    # taxonomy tags. Responses are byte-for-byte the same JSON either way.
+    fast_json: bool = os.getenv("FAST_JSON", "0").lower() not in ("0", "false", "no")
+    # Shared secret for /api/v1/admin endpoints; unset disables them.
+    admin_token: str | None = os.getenv("ADMIN_TOKEN")
 
 
 settings = Settings()
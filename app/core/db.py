@@ -1,16 +1,62 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import asyncio
+import logging
+import math
+import time
+import weakref
+from collections.abc import AsyncGenerator, Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
 
 from app.core.config import settings
-from app.models.base import Base  # re-export for tests expecting Base in this module
+from app.core.pool import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    PoolStats,
+    instrument,
+)
+from app.models.base import Base  # noqa: F401 - re-exported for callers expecting it here
+
+logger = logging.getLogger("care_baby_ivy")
+
+sync_pool_stats = PoolStats()
+async_pool_stats = PoolStats()
+replica_pool_stats = PoolStats()
+
+
+def engine_options(asyncpg: bool = False) -> dict:
+    """Pool and connection keyword arguments for create_engine from settings."""
+    options: dict = {
+        "poolclass": InstrumentedAsyncQueuePool if asyncpg else InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    timeout = settings.db_statement_timeout_ms
+    if timeout:
+        if asyncpg:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+    return options
+
+
+def _create_engine():
+    engine = create_engine(settings.database_url, **engine_options())
+    instrument(engine, sync_pool_stats)
+    return engine
 
 
 # Create a SQLAlchemy engine only if DATABASE_URL is provided.
-_engine = create_engine(settings.database_url) if settings.database_url else None
+_engine = _create_engine() if settings.database_url else None
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine) if _engine else None
 
 
@@ -22,3 +68,143 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def _asyncpg_url(url: str) -> str:
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def async_database_url() -> str | None:
+    """DATABASE_ASYNC_URL, or DATABASE_URL with its driver swapped for asyncpg."""
+    if settings.database_async_url:
+        return settings.database_async_url
+    if not settings.database_url:
+        return None
+    return _asyncpg_url(settings.database_url)
+
+
+# asyncpg connections belong to the event loop that opened them, so pools are
+# kept per loop: one per uvicorn worker, one per loop in test clients.
+_async_engines: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncEngine] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_engine() -> AsyncEngine:
+    loop = asyncio.get_running_loop()
+    engine = _async_engines.get(loop)
+    if engine is None:
+        url = async_database_url()
+        if url is None:
+            raise RuntimeError("DATABASE_URL is not configured.")
+        engine = create_async_engine(url, **engine_options(asyncpg=True))
+        instrument(engine.sync_engine, async_pool_stats)
+        _async_engines[loop] = engine
+    return engine
+
+
+_replica_engines: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[str, AsyncEngine]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_replica_engine() -> AsyncEngine | None:
+    """The running loop's engine for DATABASE_REPLICA_URL, or None without a replica."""
+    if not settings.database_replica_url:
+        return None
+    url = _asyncpg_url(settings.database_replica_url)
+    loop = asyncio.get_running_loop()
+    cached = _replica_engines.get(loop)
+    if cached is None or cached[0] != url:
+        options = engine_options(asyncpg=True)
+        # Fail over quickly rather than hold the request on a dead replica
+        options["connect_args"] = {**options.get("connect_args", {}), "timeout": settings.replica_connect_timeout}
+        engine = create_async_engine(url, **options)
+        instrument(engine.sync_engine, replica_pool_stats)
+        cached = _replica_engines[loop] = (url, engine)
+    return cached[1]
+
+
+async def dispose_async_engine() -> None:
+    """Close the running loop's pools; called on application shutdown."""
+    loop = asyncio.get_running_loop()
+    engine = _async_engines.pop(loop, None)
+    if engine is not None:
+        await engine.dispose()
+    replica = _replica_engines.pop(loop, None)
+    if replica is not None:
+        await replica[1].dispose()
+
+
+def _new_session(engine: AsyncEngine) -> AsyncSession:
+    return AsyncSession(engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with _new_session(get_async_engine()) as db:
+        yield db
+
+
+# Read-your-writes: a write stamps the client with a short-lived cookie
+# holding its wall-clock time, so the window holds on whichever worker
+# serves the next read.
+WRITE_COOKIE = "last_write"
+_replica_down_until = 0.0
+
+
+def note_write(response: Response) -> None:
+    """Send the client's reads to the primary for the read-your-writes window."""
+    window = settings.replica_read_your_writes_seconds
+    if window <= 0 or not settings.database_replica_url:
+        return
+    response.set_cookie(
+        WRITE_COOKIE, f"{time.time():.3f}", max_age=math.ceil(window), httponly=True, samesite="lax"
+    )
+
+
+def _wrote_recently(request: Request) -> bool:
+    try:
+        written = float(request.cookies.get(WRITE_COOKIE, ""))
+    except ValueError:
+        return False
+    return 0 <= time.time() - written < settings.replica_read_your_writes_seconds
+
+
+def is_replica(db: Session) -> bool:
+    """True for sessions reading from the replica, whose data may lag.
+
+    Process-wide caches are filled from the primary only, so replica lag
+    is never cached.
+    """
+    return bool(db.info.get("replica"))
+
+
+async def get_async_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only routes: the replica when one is configured and up.
+
+    Reads fall back to the primary while the replica is unreachable and for
+    clients inside their read-your-writes window (see :func:`note_write`).
+    """
+    global _replica_down_until
+    replica = get_replica_engine()
+    if (
+        replica is not None
+        and time.monotonic() >= _replica_down_until
+        and not _wrote_recently(request)
+    ):
+        db = _new_session(replica)
+        db.info["replica"] = True
+        try:
+            await db.connection()
+        except (OSError, exc.DBAPIError, exc.TimeoutError):
+            await db.close()
+            _replica_down_until = time.monotonic() + settings.replica_retry_interval
+            logger.warning(
+                "Replica unavailable; reading from the primary for %.0fs", settings.replica_retry_interval
+            )
+        else:
+            async with db:
+                yield db
+            return
+    async with _new_session(get_async_engine()) as db:
+        yield db
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+import weakref
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended.
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        count = sum(self.counts)
+        labels = [f"le_{b}ms" for b in BUCKETS_MS] + [f"gt_{BUCKETS_MS[-1]}ms"]
+        return {
+            "count": count,
+            "avg_ms": self.total_ms / count if count else None,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(labels, self.counts, strict=True)),
+        }
+
+
+class PoolStats:
+    """Checkout counters and timings for one engine's connection pool.
+
+    ``wait`` is the time spent getting a connection from the pool, including
+    opening a new one; ``held`` is checkout to checkin. A long wait with a
+    short hold means the pool is starved; a long hold means slow queries or
+    requests sitting on their connection.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # Async engines are per event loop; pools leave with their engine
+        self._pools: weakref.WeakSet[QueuePool] = weakref.WeakSet()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checked_out = 0
+            self.max_checked_out = 0
+            self.connects = 0
+            self.invalidations = 0
+            self.timeouts = 0
+            self.wait = Histogram()
+            self.held = Histogram()
+
+    def waited(self, ms: float) -> None:
+        with self._lock:
+            self.wait.observe(ms)
+
+    def timed_out(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def _checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.max_checked_out = max(self.max_checked_out, self.checked_out)
+
+    def _checkin(self, held_ms: float | None) -> None:
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+            if held_ms is not None:
+                self.held.observe(held_ms)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _track(self, pool: QueuePool) -> None:
+        with self._lock:
+            self._pools.add(pool)
+
+    def _forget(self, pool: QueuePool) -> None:
+        with self._lock:
+            self._pools.discard(pool)
+
+    def stats(self) -> dict:
+        with self._lock:
+            pools = list(self._pools)
+            out: dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "max_checked_out": self.max_checked_out,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "wait_ms": self.wait.snapshot(),
+                "held_ms": self.held.snapshot(),
+            }
+        out["pools"] = [
+            {
+                "size": p.size(),
+                "checked_in": p.checkedin(),
+                "overflow": p.overflow(),
+                "checked_out": p.checkedout(),
+            }
+            for p in pools
+        ]
+        return out
+
+
+class _Instrumented:
+    stats: PoolStats | None = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()  # type: ignore[misc]
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.timed_out()
+            raise
+        if self.stats is not None:
+            self.stats.waited((time.perf_counter() - start) * 1000)
+        return record
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool built from __class__;
+        # listeners travel with the dispatch, the stats need carrying over.
+        pool = super().recreate()  # type: ignore[misc]
+        pool.stats = self.stats
+        if self.stats is not None:
+            self.stats._forget(self)  # type: ignore[arg-type]
+            self.stats._track(pool)
+        return pool
+
+
+class InstrumentedQueuePool(_Instrumented, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_Instrumented, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine: Engine, stats: PoolStats) -> None:
+    """Report ``engine``'s pool activity to ``stats``.
+
+    The engine must have been created with one of the instrumented pool
+    classes; pass ``engine.sync_engine`` for an ``AsyncEngine``.
+    """
+    pool = engine.pool
+    pool.stats = stats  # type: ignore[attr-defined]
+    stats._track(pool)  # type: ignore[arg-type]
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, record) -> None:
+        stats._count("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, record, proxy) -> None:
+        record.info["checked_out_at"] = time.perf_counter()
+        stats._checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, record) -> None:
+        # info is emptied when the connection was invalidated
+        started = record.info.pop("checked_out_at", None)
+        stats._checkin((time.perf_counter() - started) * 1000 if started is not None else None)
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, record, exception) -> None:
+        stats._count("invalidations")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder produces the same bytes, slower
+    orjson = None  # type: ignore[assignment]
+
+
+def dumps(content: Any) -> bytes:
+    """Compact UTF-8 JSON, byte-compatible with Starlette's JSONResponse."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """Response for a body that is already encoded JSON."""
+
+    media_type = "application/json"
+
+
+# Taxonomy tags are immutable for a given (slug, label, category), so their
+# encoded form is reused across responses. Custom tags are per-user and
+# unbounded; they are encoded on every use, as tag_cache leaves them out too.
+_MAX_FRAGMENTS = 50_000
+_fragments_lock = threading.Lock()
+_fragments: dict[tuple[str, str, str | None], bytes] = {}
+
+
+def tag_fragment(tag: dict) -> bytes:
+    slug, label, category = tag["slug"], tag["label"], tag.get("category")
+    if slug.startswith("custom_"):
+        return dumps({"slug": slug, "label": label, "category": category})
+    key = (slug, label, category)
+    fragment = _fragments.get(key)
+    if fragment is None:
+        fragment = dumps({"slug": slug, "label": label, "category": category})
+        with _fragments_lock:
+            if len(_fragments) >= _MAX_FRAGMENTS:
+                _fragments.clear()
+            _fragments[key] = fragment
+    return fragment
+
+
+def tags_json(tags: Iterable[dict]) -> bytes:
+    return b"[" + b",".join(tag_fragment(t) for t in tags) + b"]"
+
+
+def child_tags_json(child_id: str, tags: Iterable[dict]) -> bytes:
+    """Encoded ChildTagsOut, with the same field order and values."""
+    return b'{"child_id":%s,"tags":%s,"suggestions":[]}' % (dumps(child_id), tags_json(tags))
@@ -1,19 +1,45 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 import time
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 
+from app.api.v1.admin import router as admin_router
 from app.api.v1.children import router as children_router
 from app.api.v1.tags import router as tags_router
 from app.core.config import settings
+from app.core.db import dispose_async_engine
+from app.services import suggest_index, synonyms, tag_events, tag_extract
 
 logger = logging.getLogger("care_baby_ivy")
 
-app = FastAPI(title="Care Baby Ivy")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stoppers = []
+    if settings.database_url and settings.tag_events_listen:
+        stoppers.append(tag_events.start_listener())
+    if settings.database_url:
+        # The first builds are CPU-bound; keep them off the event loop
+        if settings.suggest_mode == "memory":
+            stoppers.append(await asyncio.to_thread(suggest_index.start_builder))
+        stoppers.append(await asyncio.to_thread(tag_extract.start_builder))
+    if settings.synonyms_watch_interval > 0:
+        stoppers.append(synonyms.start_watcher(settings.synonyms_watch_interval))
+    try:
+        yield
+    finally:
+        for stop in stoppers:
+            stop()
+        await dispose_async_engine()
+
+
+app = FastAPI(title="Care Baby Ivy", lifespan=lifespan)
 
 
 @app.middleware("http")
@@ -45,6 +71,7 @@ def root() -> dict[str, str]:
 
 app.include_router(tags_router)
 app.include_router(children_router)
+app.include_router(admin_router)
 
 
 @app.exception_handler(HTTPException)
@@ -4,8 +4,8 @@ import os
 import sys
 from logging.config import fileConfig
 
-from sqlalchemy import engine_from_config
-from sqlalchemy import pool
+from sqlalchemy import engine_from_config, pool
+
 from alembic import context
 
 # Ensure app package is importable
@@ -17,8 +17,7 @@ for p in {_project_root, _app_dir}:
     if p not in sys.path:
         sys.path.insert(0, p)
 
-from app.models import Base  # noqa: E402
-
+from app.models import Base
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -7,10 +7,10 @@ Create Date: 2025-09-08 00:01:00.000000
 """
 from __future__ import annotations
 
-from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from alembic import op
 
 # revision identifiers, used by Alembic.
 revision = "202409080001"
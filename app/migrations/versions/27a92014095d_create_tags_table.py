@@ -6,10 +6,11 @@ Create Date: 2025-09-09 22:11:07.239587
 """
 from __future__ import annotations
 
-from alembic import op
 import sqlalchemy as sa
 from sqlalchemy.dialects import postgresql
 
+from alembic import op
+
 # revision identifiers, used by Alembic.
 revision = '27a92014095d'
 down_revision = '202409080001'
@@ -0,0 +1,28 @@
+"""enable pg_trgm and add trigram index on lower(tag.label)
+
+Revision ID: a3c5e7f9b2d1
+Revises: 7e9d1f8c4d13
+Create Date: 2026-10-18 00:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a3c5e7f9b2d1"
+down_revision = "7e9d1f8c4d13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tag_label_trgm "
+        "ON tag USING gin ((lower(label)) gin_trgm_ops);"
+    )
+
+
+def downgrade() -> None:
+    # The extension is left installed; other objects may depend on it.
+    op.execute("DROP INDEX IF EXISTS idx_tag_label_trgm;")
@@ -0,0 +1,62 @@
+"""flag tag catalog notifications that only added custom tags
+
+Revision ID: a7c9e1f3b5d8
+Revises: f6b8d0e2a4c7
+Create Date: 2026-10-18 09:00:00
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a7c9e1f3b5d8"
+down_revision = "f6b8d0e2a4c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Tagging children creates custom_* tags all day; taxonomy-derived caches
+    # ignore them, so such inserts append " custom" to the payload and
+    # workers skip the full invalidation. Transition tables need a trigger of
+    # its own per event, so INSERT moves out of tag_catalog_changed.
+    op.execute(
+        r"""
+        CREATE OR REPLACE FUNCTION notify_tag_catalog_inserted() RETURNS trigger AS $$
+        DECLARE
+            payload text := extract(epoch FROM clock_timestamp())::text;
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM new_rows) THEN
+                RETURN NULL;
+            END IF;
+            IF NOT EXISTS (SELECT 1 FROM new_rows WHERE slug NOT LIKE 'custom\_%') THEN
+                payload := payload || ' custom';
+            END IF;
+            PERFORM pg_notify('tag_catalog', payload);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute("DROP TRIGGER IF EXISTS tag_catalog_changed ON tag;")
+    op.execute(
+        "CREATE TRIGGER tag_catalog_changed "
+        "AFTER UPDATE OR DELETE OR TRUNCATE ON tag "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_tag_catalog_changed();"
+    )
+    op.execute(
+        "CREATE TRIGGER tag_catalog_inserted "
+        "AFTER INSERT ON tag REFERENCING NEW TABLE AS new_rows "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_tag_catalog_inserted();"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tag_catalog_inserted ON tag;")
+    op.execute("DROP FUNCTION IF EXISTS notify_tag_catalog_inserted();")
+    op.execute("DROP TRIGGER IF EXISTS tag_catalog_changed ON tag;")
+    op.execute(
+        "CREATE TRIGGER tag_catalog_changed "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tag "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_tag_catalog_changed();"
+    )
@@ -0,0 +1,26 @@
+"""create tags / child_tags compatibility views
+
+Revision ID: c1e3a5b7d9f2
+Revises: a3c5e7f9b2d1
+Create Date: 2026-10-18 00:10:00
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c1e3a5b7d9f2"
+down_revision = "a3c5e7f9b2d1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Pluralized read-only aliases used by reporting queries and tests.
+    op.execute("CREATE OR REPLACE VIEW tags AS SELECT * FROM tag;")
+    op.execute("CREATE OR REPLACE VIEW child_tags AS SELECT * FROM child_tag;")
+
+
+def downgrade() -> None:
+    op.execute("DROP VIEW IF EXISTS child_tags;")
+    op.execute("DROP VIEW IF EXISTS tags;")
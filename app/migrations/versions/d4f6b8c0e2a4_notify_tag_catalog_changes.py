@@ -0,0 +1,41 @@
+"""notify listeners when the tag catalog changes
+
+Revision ID: d4f6b8c0e2a4
+Revises: c1e3a5b7d9f2
+Create Date: 2026-10-18 00:20:00
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4f6b8c0e2a4"
+down_revision = "c1e3a5b7d9f2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTIFY is transactional: listeners hear about a change only once it
+    # commits. The payload is the trigger time (epoch seconds) so workers can
+    # report invalidation lag.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_tag_catalog_changed() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('tag_catalog', extract(epoch FROM clock_timestamp())::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER tag_catalog_changed "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON tag "
+        "FOR EACH STATEMENT EXECUTE FUNCTION notify_tag_catalog_changed();"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tag_catalog_changed ON tag;")
+    op.execute("DROP FUNCTION IF EXISTS notify_tag_catalog_changed();")
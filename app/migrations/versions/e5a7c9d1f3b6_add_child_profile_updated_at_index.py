@@ -0,0 +1,26 @@
+"""add child_profile(updated_at, id) index for incremental exports
+
+Revision ID: e5a7c9d1f3b6
+Revises: d4f6b8c0e2a4
+Create Date: 2026-10-18 00:30:00
+"""
+from __future__ import annotations
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5a7c9d1f3b6"
+down_revision = "d4f6b8c0e2a4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS idx_child_profile_updated_at "
+        "ON child_profile (updated_at, id);"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_child_profile_updated_at;")
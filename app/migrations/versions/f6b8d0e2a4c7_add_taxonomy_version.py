@@ -0,0 +1,34 @@
+"""add taxonomy_version for diff-aware seeding
+
+Revision ID: f6b8d0e2a4c7
+Revises: e5a7c9d1f3b6
+Create Date: 2026-10-18 01:10:00
+"""
+from __future__ import annotations
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f6b8d0e2a4c7"
+down_revision = "e5a7c9d1f3b6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "taxonomy_version",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.String(length=64), nullable=False),
+        sa.Column("tags", sa.Integer(), nullable=False),
+        sa.Column(
+            "applied_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")
+        ),
+        sa.CheckConstraint("id = 1", name="ck_taxonomy_version_single_row"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("taxonomy_version")
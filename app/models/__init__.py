@@ -1,7 +1,7 @@
-from app.models.base import Base
-
 # Import models so Alembic can discover them via Base.metadata
-from app.models.child import ChildProfile  # noqa: F401
-from app.models.tag import Tag, ChildTag  # noqa: F401
-from app.models.article import ResearchArticle  # noqa: F401
+from app.models.article import ResearchArticle
+from app.models.base import Base
+from app.models.child import ChildProfile
+from app.models.tag import ChildTag, Tag, TaxonomyVersion
 
+__all__ = ["Base", "ChildProfile", "ChildTag", "ResearchArticle", "Tag", "TaxonomyVersion"]
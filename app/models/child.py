@@ -1,25 +1,45 @@
 from __future__ import annotations
 
+import enum
 import uuid
 from datetime import date
-from typing import Optional
 
-import enum
-from sqlalchemy import String
 import sqlalchemy as sa
+from sqlalchemy import String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, validates
 
 from app.models.base import Base, TimestampMixin
 
 
-class Gender(str, enum.Enum):  # type: ignore[misc]
+def coerce_user_id(value) -> uuid.UUID:
+    """Map an external user id to the UUID stored in ``child_profile.user_id``."""
+    try:
+        if isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
+    except ValueError:
+        # Deterministic UUID from provided string
+        return uuid.uuid5(uuid.NAMESPACE_URL, f"user:{value}")
+
+
+class Gender(enum.StrEnum):
     female = "female"
     male = "male"
     other = "other"
     undisclosed = "undisclosed"
 
 
+def coerce_gender(value) -> Gender | None:
+    if value is None:
+        return None
+    if isinstance(value, Gender):
+        return value
+    s = str(value).lower().strip()
+    mapping = {"f": Gender.female, "m": Gender.male, "female": Gender.female, "male": Gender.male, "other": Gender.other, "undisclosed": Gender.undisclosed}
+    return mapping.get(s, None)
+
+
 class ChildProfile(TimestampMixin, Base):
     __tablename__ = "child_profile"
 
@@ -28,28 +48,16 @@ class ChildProfile(TimestampMixin, Base):
     )
     user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
-    dob: Mapped[Optional[date]]
-    gender: Mapped[Optional[Gender]] = mapped_column(sa.Enum(Gender, name="gender"))
-    region: Mapped[Optional[str]] = mapped_column(String(120))
-    language_pref: Mapped[Optional[str]] = mapped_column(String(50))
-    age_stage: Mapped[Optional[str]] = mapped_column(String(50))
+    dob: Mapped[date | None]
+    gender: Mapped[Gender | None] = mapped_column(sa.Enum(Gender, name="gender"))
+    region: Mapped[str | None] = mapped_column(String(120))
+    language_pref: Mapped[str | None] = mapped_column(String(50))
+    age_stage: Mapped[str | None] = mapped_column(String(50))
 
     @validates("user_id")
     def _coerce_user_id(self, key, value):  # type: ignore[override]
-        try:
-            if isinstance(value, uuid.UUID):
-                return value
-            return uuid.UUID(str(value))
-        except Exception:
-            # Deterministic UUID from provided string
-            return uuid.uuid5(uuid.NAMESPACE_URL, f"user:{value}")
+        return coerce_user_id(value)
 
     @validates("gender")
     def _coerce_gender(self, key, value):  # type: ignore[override]
-        if value is None:
-            return None
-        if isinstance(value, Gender):
-            return value
-        s = str(value).lower().strip()
-        mapping = {"f": Gender.female, "m": Gender.male, "female": Gender.female, "male": Gender.male, "other": Gender.other, "undisclosed": Gender.undisclosed}
-        return mapping.get(s, None)
+        return coerce_gender(value)
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
+import enum
 import uuid
-from typing import Optional
+from datetime import datetime
 
-import enum
 import sqlalchemy as sa
-from sqlalchemy import Boolean, ForeignKey, String, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    CheckConstraint,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
 
 
-class TagCategory(str, enum.Enum):  # type: ignore[misc]
+class TagCategory(enum.StrEnum):
     general = "general"
     development = "development"
     nutrition = "nutrition"
@@ -28,7 +37,7 @@ class Tag(Base):
     )
     slug: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
     label: Mapped[str] = mapped_column(String(200), nullable=False)
-    category: Mapped[Optional[TagCategory]] = mapped_column(
+    category: Mapped[TagCategory | None] = mapped_column(
         sa.Enum(TagCategory, name="tag_category")
     )
     active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
@@ -46,3 +55,17 @@ class ChildTag(Base):
     tag_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("tag.id", ondelete="CASCADE"), primary_key=True
     )
+
+
+class TaxonomyVersion(Base):
+    """Single row: hash of the seeded taxonomy, for cache invalidation downstream."""
+
+    __tablename__ = "taxonomy_version"
+    __table_args__ = (CheckConstraint("id = 1", name="ck_taxonomy_version_single_row"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    version: Mapped[str] = mapped_column(String(64), nullable=False)
+    tags: Mapped[int] = mapped_column(Integer, nullable=False)
+    applied_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
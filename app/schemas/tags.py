@@ -1,22 +1,46 @@
 from __future__ import annotations
 
-from typing import Optional
+from pydantic import BaseModel, Field
 
-from pydantic import BaseModel
+# Children per bulk tag write; the whole body is resolved and written in
+# one transaction.
+MAX_BULK_WRITE_CHILDREN = 1000
 
 
 class TagOut(BaseModel):
     slug: str
     label: str
-    category: Optional[str] = None
+    category: str | None = None
 
 
 class ChildTagsOut(BaseModel):
     child_id: str
     tags: list[TagOut]
-    suggestions: Optional[list[TagOut]] = None
+    suggestions: list[TagOut] | None = None
+
+
+class ChildrenTagsOut(BaseModel):
+    children: list[ChildTagsOut]
 
 
 class ChildTagsIn(BaseModel):
     tags: list[str]
 
+
+class ChildrenTagsIn(BaseModel):
+    # child_id -> tag inputs, as for PUT /children/{child_id}/tags
+    children: dict[str, list[str]] = Field(..., min_length=1, max_length=MAX_BULK_WRITE_CHILDREN)
+
+
+class SuggestQueryIn(BaseModel):
+    q: str
+    limit: int = Field(8, ge=1)
+    category: str | None = None
+
+
+class SuggestBatchIn(BaseModel):
+    queries: list[SuggestQueryIn] = Field(..., min_length=1, max_length=50)
+
+
+class ExtractIn(BaseModel):
+    text: str = Field(..., max_length=50_000)
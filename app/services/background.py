@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+from app.services import tag_events
+
+logger = logging.getLogger("care_baby_ivy")
+
+T = TypeVar("T")
+
+_RETRY_DELAY = 5.0
+
+
+class BackgroundBuilder(Generic[T]):
+    """A value derived from the tag catalog and rebuilt off the request path.
+
+    Readers only ever get the published value. When it is stale they wake a
+    single builder thread, which waits ``debounce`` seconds so a burst of
+    catalog changes costs one rebuild, builds the replacement and publishes
+    it with one reference assignment; until then the previous value is
+    served. Only a process that was never warmed up builds in the caller,
+    once, with concurrent callers waiting for that build.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        build: Callable[[], T],
+        is_stale: Callable[[T], bool] = lambda value: False,
+        debounce: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.debounce = debounce
+        self._build = build
+        self._is_stale = is_stale
+        # (value, tag_events version it was built at, monotonic build time)
+        self._published: tuple[T, int, float] | None = None
+        self._dirty = True
+        self._build_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def current(self) -> tuple[T, int]:
+        """The published value and the catalog version it reflects."""
+        published = self._published
+        if published is None:
+            self.ensure()
+            published = self._published
+            assert published is not None
+        value, version, _ = published
+        if self._dirty or self._is_stale(value):
+            self.request()
+        return value, version
+
+    def get(self) -> T:
+        return self.current()[0]
+
+    def age(self) -> float:
+        published = self._published
+        return time.monotonic() - published[2] if published is not None else float("inf")
+
+    def ensure(self) -> T:
+        """Return the published value, building it here if there is none yet."""
+        published = self._published
+        if published is not None:
+            return published[0]
+        with self._build_lock:
+            if self._published is None:
+                return self._rebuild()
+            return self._published[0]
+
+    async def ensure_async(self) -> None:
+        """``ensure`` for the event loop: a cold build runs in a worker thread."""
+        if self._published is None:
+            await asyncio.to_thread(self.ensure)
+
+    def refresh(self) -> T:
+        """Rebuild in the calling thread and publish the result."""
+        with self._build_lock:
+            return self._rebuild()
+
+    def _rebuild(self) -> T:
+        # Cleared first: a change that lands during the build marks it dirty again
+        self._dirty = False
+        version = tag_events.version()
+        try:
+            value = self._build()
+        except Exception:
+            self._dirty = True
+            raise
+        self._published = (value, version, time.monotonic())
+        return value
+
+    def invalidate(self) -> None:
+        """Mark the value stale; subscribe this to :mod:`tag_events`."""
+        self._dirty = True
+        if self._published is not None:
+            self.request()
+
+    def request(self) -> None:
+        """Ask the builder thread for a rebuild; never blocks."""
+        self._wake.set()
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            self.start()
+
+    def start(self) -> Callable[[], None]:
+        """Start the builder thread if it is not running; returns a stop callback."""
+        with self._start_lock:
+            thread, stop = self._thread, self._stop
+            if thread is None or not thread.is_alive():
+                stop = self._stop = threading.Event()
+                thread = self._thread = threading.Thread(
+                    target=self._run, args=(stop,), name=self.name, daemon=True
+                )
+                thread.start()
+
+        def _stop() -> None:
+            stop.set()
+            self._wake.set()
+            thread.join(timeout=5)
+
+        return _stop
+
+    def _run(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            self._wake.wait()
+            if stop.wait(self.debounce):
+                return
+            self._wake.clear()
+            published = self._published
+            if published is not None and not self._dirty and not self._is_stale(published[0]):
+                continue
+            try:
+                self.refresh()
+            except Exception:
+                logger.warning("%s rebuild failed; serving the previous build", self.name, exc_info=True)
+                stop.wait(_RETRY_DELAY)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from datetime import datetime
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.models.child import ChildProfile
+from app.models.tag import ChildTag, Tag
+
+
+def children_stmt(since: datetime | None = None) -> Select:
+    """Child profiles with their tag slugs, oldest change first.
+
+    ``since`` is inclusive: rows sharing the boundary timestamp are emitted
+    again, so incremental consumers should upsert by ``id``.
+    """
+    slugs = (
+        select(func.array_agg(aggregate_order_by(Tag.slug, Tag.slug)))
+        .select_from(ChildTag)
+        .join(Tag, Tag.id == ChildTag.tag_id)
+        .where(ChildTag.child_id == ChildProfile.id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        ChildProfile.id,
+        ChildProfile.user_id,
+        ChildProfile.name,
+        ChildProfile.dob,
+        ChildProfile.gender,
+        ChildProfile.region,
+        ChildProfile.language_pref,
+        ChildProfile.age_stage,
+        ChildProfile.created_at,
+        ChildProfile.updated_at,
+        slugs.label("tags"),
+    )
+    if since is not None:
+        stmt = stmt.where(ChildProfile.updated_at >= since)
+    return stmt.order_by(ChildProfile.updated_at, ChildProfile.id)
+
+
+def _iso(value) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+def iter_ndjson(
+    db: Session, since: datetime | None = None, batch_size: int = 1000
+) -> Iterator[str]:
+    """Yield NDJSON chunks of ``batch_size`` children each.
+
+    Rows are read through a server-side cursor (``yield_per``), so memory
+    stays bounded by one batch regardless of table size.
+    """
+    result = db.execute(children_stmt(since).execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        yield "".join(
+            json.dumps(
+                {
+                    "id": str(row.id),
+                    "user_id": str(row.user_id),
+                    "name": row.name,
+                    "dob": _iso(row.dob),
+                    "gender": row.gender.value if row.gender is not None else None,
+                    "region": row.region,
+                    "language_pref": row.language_pref,
+                    "age_stage": row.age_stage,
+                    "created_at": _iso(row.created_at),
+                    "updated_at": _iso(row.updated_at),
+                    "tags": row.tags or [],
+                },
+                ensure_ascii=False,
+            )
+            + "\n"
+            for row in rows
+        )
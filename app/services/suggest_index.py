@@ -0,0 +1,561 @@
+from __future__ import annotations
+
+import heapq
+import logging
+import re
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import groupby
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.tag import Tag
+from app.services import synonyms as syn
+from app.services import tag_events
+from app.services.background import BackgroundBuilder
+from app.services.taxonomy_artifact import SynonymTable
+
+logger = logging.getLogger("care_baby_ivy")
+
+CATEGORY_ORDER = {
+    "topic": 0,
+    "condition": 1,
+    "allergy": 2,
+    "age": 3,
+    "preference": 4,
+    "custom": 5,
+}
+
+# Queries are at least 2 chars long: bigrams and trigrams answer 2- and
+# 3-char queries exactly, 4-grams narrow everything longer.
+_GRAM_SIZES = (2, 3, 4)
+# Posting lists are intersected until at most this many candidates are left
+# to check with ``in``.
+_CANDIDATE_CHECKS = 64
+
+# Short prefixes cover thousands of keys; the best-ranked ids of each are kept
+# so the prefix tiers need not rank the whole range. Enough for a limit of 20
+# after the label tier's 20 hits are skipped.
+_PREFIX_TOP_LENGTHS = (2, 3)
+_PREFIX_TOP_SIZE = 40
+
+# Fuzzy tier: SymSpell-style deletion index over the words of labels and
+# synonym keys. Only the first _FUZZY_PREFIX chars of a word are expanded,
+# which bounds the index at ~30 variants per word. Variants one delete away
+# are indexed apart from those two deletes away, so words within distance 1
+# are found (and can fill the results) before any distance-2 candidate is
+# checked. Two edits are only allowed when the first letter was typed right.
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_FUZZY_PREFIX = 7
+_FUZZY_MAX_DISTANCE = 2
+
+
+def category_value(cat) -> str | None:
+    if cat is None:
+        return None
+    if hasattr(cat, "value"):
+        cat_val = cat.value  # type: ignore[attr-defined]
+    else:
+        cat_val = str(cat)
+    return str(cat_val).lower()
+
+
+def _postings(texts: Iterable[Iterable[str]]) -> dict[str, list[int]]:
+    acc: defaultdict[str, list[int]] = defaultdict(list)
+    for idx, group in enumerate(texts):
+        grams = {
+            text[i : i + n]
+            for text in group
+            for n in _GRAM_SIZES
+            for i in range(len(text) - n + 1)
+        }
+        for gram in grams:
+            acc[gram].append(idx)
+    return dict(acc)
+
+
+def _candidates(postings: Mapping[str, Sequence[int]], qn: str) -> Sequence[int]:
+    """Ids, in order, whose texts have every 4-gram of ``qn``; a superset of the hits."""
+    n = _GRAM_SIZES[-1]
+    if len(qn) <= n:
+        return postings.get(qn, ())
+    plists = sorted((postings.get(qn[i : i + n], ()) for i in range(len(qn) - n + 1)), key=len)
+    if len(plists[0]) <= _CANDIDATE_CHECKS:
+        return plists[0]
+    found = set(plists[0])
+    for plist in plists[1:]:
+        if len(plist) > 8 * len(found):
+            # Lists are sorted: probing a long one beats walking it
+            found = {i for i in found if _contains(plist, i)}
+        else:
+            found.intersection_update(plist)
+        if len(found) <= _CANDIDATE_CHECKS:
+            break
+    return sorted(found)
+
+
+def _contains(ids: Sequence[int], idx: int) -> bool:
+    pos = bisect_left(ids, idx)
+    return pos < len(ids) and ids[pos] == idx
+
+
+def _prefix_tops(keys: tuple[str, ...], key_ids: Sequence[int]) -> dict[str, tuple[int, ...]]:
+    tops: dict[str, tuple[int, ...]] = {}
+    for n in _PREFIX_TOP_LENGTHS:
+        for prefix, group in groupby(range(len(keys)), key=lambda i: keys[i][:n]):
+            ids = {key_ids[i] for i in group} - {-1}
+            if len(ids) > _PREFIX_TOP_SIZE and len(prefix) == n:
+                tops[prefix] = tuple(heapq.nsmallest(_PREFIX_TOP_SIZE, ids))
+    return tops
+
+
+def _max_distance(token: str) -> int:
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 6 else 2
+
+
+def _deletes(word: str, depth: int) -> list[set[str]]:
+    """Variants of ``word`` by number of deleted chars, ``0..depth``."""
+    levels = [{word}]
+    for _ in range(depth):
+        levels.append({w[:i] + w[i + 1 :] for w in levels[-1] for i in range(len(w))})
+    return levels
+
+
+def _osa_distance(a: str, b: str, max_d: int) -> int:
+    """Optimal string alignment distance, or ``max_d + 1`` once it is exceeded."""
+    # Typos are local: equal ends never need an edit
+    start, shortest = 0, min(len(a), len(b))
+    while start < shortest and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shortest - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start : len(a) - end], b[start : len(b) - end]
+    la, lb = len(a), len(b)
+    if not la or not lb:
+        return min(la + lb, max_d + 1)
+    if max_d == 0 or abs(la - lb) > max_d:
+        return max_d + 1
+    if la == lb and (la == 1 or (la == 2 and a[0] == b[1] and a[1] == b[0])):
+        return 1
+    if max_d == 1:
+        return 2
+    # The first chars differ: substitute, delete, insert or transpose them
+    rest = max_d - 1
+    d = min(
+        _osa_distance(a[1:], b[1:], rest),
+        _osa_distance(a[1:], b, rest),
+        _osa_distance(a, b[1:], rest),
+    )
+    if la > 1 and lb > 1 and a[0] == b[1] and a[1] == b[0]:
+        d = min(d, _osa_distance(a[2:], b[2:], rest))
+    return d + 1
+
+
+def _word_distance(token: str, word: str, max_d: int) -> int:
+    limit = max_d if word[:1] == token[:1] else min(max_d, 1)
+    d = _osa_distance(token, word, limit)
+    return d if d <= limit else max_d + 1
+
+
+def _prefix_range(keys: tuple[str, ...], qn: str) -> range:
+    return range(bisect_left(keys, qn), bisect_left(keys, qn + "\uffff"))
+
+
+@dataclass(frozen=True, slots=True)
+class _Entry:
+    slug: str
+    label: str
+    category: str | None
+    label_norm: str
+    syn_keys: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SuggestSnapshot:
+    """Immutable, precompiled view of active tags and synonyms for suggest.
+
+    Entry ids are positions in static rank order (category rank, label length,
+    slug), so ``min``/``nsmallest`` over ids is the ranking tie-breaker and
+    per-request work is bisects, posting-list scans and a bounded top-k.
+    """
+
+    entries: tuple[_Entry, ...]
+    slug_ids: Mapping[str, int]
+    slug_synonyms: Mapping[str, tuple[str, ...]]
+    label_keys: tuple[str, ...]
+    label_key_ids: tuple[int, ...]
+    syn_keys: tuple[str, ...]
+    syn_key_slugs: tuple[str, ...]
+    syn_key_ids: tuple[int, ...]
+    label_tops: Mapping[str, tuple[int, ...]]
+    syn_tops: Mapping[str, tuple[int, ...]]
+    postings: Mapping[str, Sequence[int]]
+    words: tuple[str, ...]
+    word_ids: Mapping[str, int]
+    word_entries: tuple[tuple[int, ...], ...]
+    word_ranks: tuple[int, ...]
+    deletes: Mapping[str, Sequence[int]]
+    far_deletes: Mapping[str, Sequence[int]]
+    synmap: Mapping[str, str]
+
+    @classmethod
+    def build(cls, rows: Iterable, synmap: Mapping[str, str]) -> SuggestSnapshot:
+        keys_by_slug: dict[str, list[str]] = {}
+        for key, slug in synmap.items():
+            keys_by_slug.setdefault(slug, []).append(key)
+        slug_synonyms = {slug: tuple(keys) for slug, keys in keys_by_slug.items()}
+
+        by_slug: dict[str, _Entry] = {}
+        for row in rows:
+            if row.slug in by_slug:
+                continue
+            by_slug[row.slug] = _Entry(
+                slug=row.slug,
+                label=row.label,
+                category=category_value(row.category),
+                label_norm=syn.normalize(row.label),
+                syn_keys=slug_synonyms.get(row.slug, ()),
+            )
+        entries = tuple(
+            sorted(
+                by_slug.values(),
+                key=lambda e: (CATEGORY_ORDER.get(e.category, 9), len(e.label), e.slug),
+            )
+        )
+        labels = sorted((e.label_norm, idx) for idx, e in enumerate(entries))
+        syn_pairs = sorted(synmap.items())
+        slug_ids = {e.slug: idx for idx, e in enumerate(entries)}
+        label_keys = tuple(key for key, _ in labels)
+        label_key_ids = tuple(idx for _, idx in labels)
+        syn_keys = tuple(key for key, _ in syn_pairs)
+        # -1 for keys naming a tag that is not indexed
+        syn_key_ids = tuple(slug_ids.get(slug, -1) for _, slug in syn_pairs)
+
+        word_entry_lists: dict[str, list[int]] = {}
+        for idx, e in enumerate(entries):
+            words_in_entry: set[str] = set()
+            for text in (e.label_norm, *e.syn_keys):
+                words_in_entry.update(_WORD_RE.findall(text))
+            for word in words_in_entry:
+                word_entry_lists.setdefault(word, []).append(idx)
+        # Word ids follow the rank of each word's best entry, so sorted ids
+        # are in rank order
+        words = tuple(word_entry_lists)
+        by_prefix: dict[str, list[int]] = {}
+        for wid, word in enumerate(words):
+            by_prefix.setdefault(word[:_FUZZY_PREFIX], []).append(wid)
+        near: dict[str, list[int]] = {}
+        far: dict[str, list[int]] = {}
+        for prefix, wids in by_prefix.items():
+            *close, distant = _deletes(prefix, _FUZZY_MAX_DISTANCE)
+            for variant in set().union(*close):
+                near.setdefault(variant, []).extend(wids)
+            for variant in distant:
+                far.setdefault(variant, []).extend(wids)
+
+        return cls(
+            entries=entries,
+            slug_ids=slug_ids,
+            slug_synonyms=slug_synonyms,
+            label_keys=label_keys,
+            label_key_ids=label_key_ids,
+            syn_keys=syn_keys,
+            syn_key_slugs=tuple(slug for _, slug in syn_pairs),
+            syn_key_ids=syn_key_ids,
+            label_tops=_prefix_tops(label_keys, label_key_ids),
+            syn_tops=_prefix_tops(syn_keys, syn_key_ids),
+            postings=_postings((e.label_norm, *e.syn_keys) for e in entries),
+            words=words,
+            word_ids={word: wid for wid, word in enumerate(words)},
+            word_entries=tuple(tuple(word_entry_lists[w]) for w in words),
+            # Best-ranked entry of each word, ascending
+            word_ranks=tuple(word_entry_lists[w][0] for w in words),
+            deletes=near,
+            far_deletes=far,
+            synmap=synmap,
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @cached_property
+    def syn_postings(self) -> dict[str, list[int]]:
+        # Only the synonym-only snapshot of trgm mode asks for these
+        return _postings((key,) for key in self.syn_keys)
+
+    def synonym_hits(self, qn: str) -> tuple[set[str], set[str]]:
+        """Slugs whose synonym keys start with / contain ``qn``."""
+        prefix = {self.syn_key_slugs[i] for i in _prefix_range(self.syn_keys, qn)}
+        contains = {
+            self.syn_key_slugs[i]
+            for i in _candidates(self.syn_postings, qn)
+            if qn in self.syn_keys[i]
+        }
+        return prefix, contains
+
+    def _candidate_words(self, token: str, levels: list[set[str]], tier: int) -> set[int]:
+        """Words that may be within ``tier`` edits of ``token`` and not closer.
+
+        ``levels`` are the deletes of the token's prefix. Tier 0 is the word
+        itself, tier 1 pairs variants at most one delete away on both sides,
+        the last tier adds every pairing left over.
+        """
+        if tier == 0:
+            wid = self.word_ids.get(token)
+            return set() if wid is None else {wid}
+        out: set[int] = set()
+        if tier == 1:
+            for variant in (*levels[0], *levels[1]):
+                out.update(self.deletes.get(variant, ()))
+            return out
+        for variant in (*levels[0], *levels[1]):
+            out.update(self.far_deletes.get(variant, ()))
+        for variant in levels[2]:
+            out.update(self.deletes.get(variant, ()))
+            out.update(self.far_deletes.get(variant, ()))
+        return out
+
+    def _fuzzy_token(self, token: str, need: int, eligible: Callable[[int], bool]) -> list[int]:
+        """The best ``need`` entries with a word near ``token``, closest first.
+
+        Tiers are checked in distance order and each in static rank order, so
+        the search stops as soon as no unchecked word can rank higher.
+        """
+        max_d = _max_distance(token)
+        levels = _deletes(token[:_FUZZY_PREFIX], max_d)
+        out: list[int] = []
+        taken: set[int] = set()
+        # Distances of checked words; a lower tier's candidates can be farther
+        distances: dict[int, int] = {}
+        for tier in range(max_d + 1):
+            want = need - len(out)
+            best: list[int] = []  # max-heap of the ``want`` best ids, negated
+            candidates = self._candidate_words(token, levels, tier)
+            candidates.update(wid for wid, d in distances.items() if d == tier)
+            for wid in sorted(candidates):
+                if len(best) == want and self.word_ranks[wid] > -best[0]:
+                    break
+                d = distances.get(wid)
+                if d is None:
+                    d = distances[wid] = _word_distance(token, self.words[wid], max_d)
+                if d > tier:
+                    continue
+                for idx in self.word_entries[wid]:
+                    if len(best) == want and idx > -best[0]:
+                        break
+                    if idx in taken or not eligible(idx):
+                        continue
+                    taken.add(idx)
+                    if len(best) == want:
+                        heapq.heapreplace(best, -idx)
+                    else:
+                        heapq.heappush(best, -idx)
+            out.extend(sorted(-i for i in best))
+            if len(out) >= need:
+                break
+        return out
+
+    def _fuzzy(
+        self, qn: str, need: int, seen: set[int], category: str | None
+    ) -> list[int]:
+        """Entries whose words match every query token within a small edit distance.
+
+        Ranked by total distance, then static rank; never scans all entries.
+        """
+        entries = self.entries
+
+        def eligible(idx: int) -> bool:
+            return idx not in seen and (category is None or entries[idx].category == category)
+
+        # Exact-only tokens first: they are the cheapest and most selective
+        tokens = sorted(dict.fromkeys(_WORD_RE.findall(qn)), key=lambda t: (_max_distance(t), -len(t)))
+        if not tokens:
+            return []
+        if len(tokens) == 1:
+            return self._fuzzy_token(tokens[0], need, eligible)
+
+        # Several tokens: narrow to entries that have a candidate word for
+        # each, then check distances only on those entries' words.
+        survivors: set[int] | None = None
+        for token in tokens:
+            max_d = _max_distance(token)
+            levels = _deletes(token[:_FUZZY_PREFIX], max_d)
+            found: set[int] = set()
+            for tier in range(max_d + 1):
+                for wid in self._candidate_words(token, levels, tier):
+                    found.update(self.word_entries[wid])
+            survivors = found if survivors is None else survivors & found
+            if not survivors:
+                return []
+        scored = []
+        for idx in survivors or ():
+            if not eligible(idx):
+                continue
+            entry = entries[idx]
+            words = set(_WORD_RE.findall(" ".join((entry.label_norm, *entry.syn_keys))))
+            total = 0
+            for token in tokens:
+                max_d = _max_distance(token)
+                d = min(_word_distance(token, word, max_d) for word in words)
+                if d > max_d:
+                    break
+                total += d
+            else:
+                scored.append((total, idx))
+        return [idx for _, idx in heapq.nsmallest(need, scored)]
+
+    def search(self, qn: str, limit: int, category: str | None = None) -> list[dict]:
+        chosen: list[int] = []
+        seen: set[int] = set()
+        entries = self.entries
+
+        def take(ids: Iterable[int], tops: Mapping[str, tuple[int, ...]]) -> None:
+            need = limit - len(chosen)
+            top = tops.get(qn)
+            if top is not None and category is None and need + len(seen) <= len(top):
+                ids = top
+            best = heapq.nsmallest(
+                need,
+                {
+                    i
+                    for i in ids
+                    if i not in seen and (category is None or entries[i].category == category)
+                },
+            )
+            chosen.extend(best)
+            seen.update(best)
+
+        take((self.label_key_ids[i] for i in _prefix_range(self.label_keys, qn)), self.label_tops)
+        if len(chosen) < limit:
+            prefix_syn = (self.syn_key_ids[i] for i in _prefix_range(self.syn_keys, qn))
+            take((i for i in prefix_syn if i >= 0), self.syn_tops)
+        if len(chosen) < limit:
+            need = limit - len(chosen)
+            contains_label: list[int] = []
+            contains_syn: list[int] = []
+            # Candidates arrive in rank order: the first ``need`` label hits
+            # are the best ones and outrank every synonym-only hit.
+            for idx in _candidates(self.postings, qn):
+                if idx in seen:
+                    continue
+                entry = entries[idx]
+                if category is not None and entry.category != category:
+                    continue
+                if qn in entry.label_norm:
+                    contains_label.append(idx)
+                    if len(contains_label) >= need:
+                        break
+                elif len(contains_syn) < need and any(qn in k for k in entry.syn_keys):
+                    contains_syn.append(idx)
+            chosen.extend(contains_label)
+            chosen.extend(contains_syn[: limit - len(chosen)])
+            seen.update(chosen)
+        if len(chosen) < limit:
+            chosen.extend(self._fuzzy(qn, limit - len(chosen), seen, category))
+
+        out: list[dict] = []
+        for idx in chosen[:limit]:
+            entry = entries[idx]
+            out.append({"slug": entry.slug, "label": entry.label, "category": entry.category})
+        return out
+
+
+_syn_snapshot: SuggestSnapshot | None = None
+# Custom tags were added since the published snapshot was built
+_custom_pending = False
+
+
+def build_snapshot(db: Session) -> SuggestSnapshot:
+    rows = db.execute(
+        select(Tag.slug, Tag.label, Tag.category).where(Tag.active.is_(True))
+    ).all()
+    return SuggestSnapshot.build(rows, syn._synonyms_map())
+
+
+def _load_snapshot() -> SuggestSnapshot:
+    # Own session on the primary: builds run on the builder thread, outside
+    # any request, and must not index a lagging replica.
+    global _custom_pending
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not configured.")
+    # Cleared first: custom tags added during the build flag the next one
+    _custom_pending = False
+    with SessionLocal() as db:
+        return build_snapshot(db)
+
+
+def _is_stale(snap: SuggestSnapshot) -> bool:
+    if snap.synmap is not syn._synonyms_map():
+        return True
+    age = builder.age()
+    if _custom_pending and age >= settings.suggest_index_custom_rebuild_interval:
+        return True
+    return not tag_events.listening() and age > settings.suggest_index_max_age
+
+
+builder: BackgroundBuilder[SuggestSnapshot] = BackgroundBuilder(
+    "suggest-index-builder", _load_snapshot, _is_stale, settings.suggest_index_rebuild_debounce
+)
+
+
+def _custom_tags_added() -> None:
+    # A full rebuild per new custom tag would keep every worker rebuilding;
+    # they rank last anyway, so the next suggest after the interval has
+    # passed asks for the rebuild (see _is_stale).
+    global _custom_pending
+    _custom_pending = True
+
+
+tag_events.subscribe(builder.invalidate)
+tag_events.subscribe(_custom_tags_added, custom_only=True)
+
+
+def get_snapshot() -> SuggestSnapshot:
+    """Return the published snapshot without rebuilding it on the request path.
+
+    Catalog changes, synonym reloads, new custom tags (at most once per
+    ``suggest_index_custom_rebuild_interval``) and, without a catalog
+    listener, ``suggest_index_max_age`` make the background builder publish
+    a replacement, while requests keep serving the previous snapshot. Only a process that skipped :func:`start_builder`
+    builds its first snapshot on first use.
+    """
+    return builder.get()
+
+
+def start_builder() -> Callable[[], None]:
+    """Build the first snapshot now, then keep it fresh in the background.
+
+    Called at startup so no request waits for the initial build; returns a
+    stop callback.
+    """
+    try:
+        builder.refresh()
+    except Exception:
+        logger.warning("suggest index warm-up failed; the first suggest builds it", exc_info=True)
+    return builder.start()
+
+
+def synonym_snapshot() -> SuggestSnapshot | SynonymTable:
+    """Snapshot of the synonym map alone, for modes that rank tags in SQL.
+
+    A map served from the compiled taxonomy answers ``synonym_hits`` itself.
+    """
+    global _syn_snapshot
+    current = _syn_snapshot
+    synmap = syn._synonyms_map()
+    if isinstance(synmap, SynonymTable):
+        return synmap
+    if current is None or current.synmap is not synmap:
+        current = SuggestSnapshot.build((), synmap)
+        _syn_snapshot = current
+    return current
+
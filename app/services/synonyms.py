@@ -1,37 +1,145 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import re
+import threading
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
 
+from app.services import tag_events, taxonomy_artifact
+
+logger = logging.getLogger("care_baby_ivy")
 
 _SPACE_RE = re.compile(r"\s+")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# Resolve project root relative to this file
+SYNONYMS_PATH = Path(__file__).resolve().parents[2] / "taxonomy" / "synonyms.json"
 
 
 def normalize(text: str) -> str:
     return _SPACE_RE.sub(" ", text.strip().lower())
 
 
-def _load_map() -> dict[str, str]:
-    # Resolve project root relative to this file
-    here = Path(__file__).resolve()
-    repo_root = here.parents[2]
-    path = repo_root / "taxonomy" / "synonyms.json"
-    with path.open("r", encoding="utf-8") as f:
-        data: dict[str, str] = json.load(f)
+@dataclass(frozen=True)
+class SynonymState:
+    """One fully built synonym map; replaced as a whole, never mutated."""
+
+    version: int
+    mapping: Mapping[str, str]
+    digest: str
+    mtime_ns: int
+
+
+def parse(raw: bytes, path: Path) -> dict[str, str]:
+    data: dict[str, str] = json.loads(raw)
+    if not isinstance(data, dict):
+        raise TypeError(f"{path} must contain a JSON object")
     # Normalize keys for robust matching
     return {normalize(k): v for k, v in data.items()}
 
 
-_SYN_MAP = _load_map()
+def _read(path: Path, version: int) -> SynonymState:
+    mtime_ns = path.stat().st_mtime_ns
+    raw = path.read_bytes()
+    mapping: Mapping[str, str]
+    # Prefer the shared, memory-mapped table when it was compiled from this file
+    artifact = taxonomy_artifact.load()
+    if artifact is not None and artifact.synonyms_digest == taxonomy_artifact.digest(raw):
+        mapping = artifact.synonyms
+    else:
+        mapping = parse(raw, path)
+    return SynonymState(version, mapping, hashlib.sha256(raw).hexdigest(), mtime_ns)
+
+
+_state = _read(SYNONYMS_PATH, 1)
+_reload_lock = threading.Lock()
 
 
-def canonicalize(text: str) -> Optional[str]:
+def state() -> SynonymState:
+    return _state
+
+
+def version() -> int:
+    """Bumped every time a changed synonyms file is swapped in."""
+    return _state.version
+
+
+def canonicalize(text: str) -> str | None:
     key = normalize(text)
-    return _SYN_MAP.get(key)
+    return _state.mapping.get(key)
+
+
+def slugify(text: str) -> str:
+    s = text.strip().lower()
+    # For custom slugs, tests expect only [a-z0-9] after prefix.
+    s = _NON_ALNUM_RE.sub("", s)
+    return s or "x"
 
 
-def _synonyms_map() -> dict[str, str]:
+def candidate_slugs(text: str) -> tuple[str | None, str]:
+    """Return ``(canonical slug or None, custom slug)`` for one stripped input.
+
+    Shared by the tag write path and scripts/import_children.py, so both
+    resolve free text to the same tags.
+    """
+    slug = canonicalize(text)
+    if slug is None:
+        # Also try direct slug match if user entered a slug
+        possible = slugify(text)
+        # Preserve given slug exactly if already looks like one
+        if text == possible:
+            slug = possible
+    return slug, f"custom_{slugify(text)}"
+
+
+def _synonyms_map() -> Mapping[str, str]:
     """Expose the normalized synonym mapping for read-only reuse."""
-    return _SYN_MAP
+    return _state.mapping
+
+
+def reload(force: bool = False) -> bool:
+    """Re-read the synonyms file if it changed; True when a new map was swapped in.
+
+    The file is skipped when its mtime is unchanged (unless ``force``) and
+    when its content hash matches the current map. The new map is built
+    before the swap, so concurrent readers see either the old or the new map.
+    Invalid files raise and leave the current map in place.
+    """
+    global _state
+    with _reload_lock:
+        current = _state
+        if not force and SYNONYMS_PATH.stat().st_mtime_ns == current.mtime_ns:
+            return False
+        new = _read(SYNONYMS_PATH, current.version + 1)
+        if new.digest == current.digest:
+            _state = SynonymState(current.version, current.mapping, current.digest, new.mtime_ns)
+            return False
+        _state = new
+    logger.info("synonyms reloaded version=%s keys=%s", new.version, len(new.mapping))
+    tag_events.tags_changed()
+    return True
+
+
+def start_watcher(interval: float) -> Callable[[], None]:
+    """Poll the synonyms file every ``interval`` seconds; returns a stop callback."""
+    stop = threading.Event()
+
+    def _watch() -> None:
+        while not stop.wait(interval):
+            try:
+                reload()
+            except Exception:
+                logger.warning("synonyms reload failed", exc_info=True)
+
+    thread = threading.Thread(target=_watch, name="synonyms-watcher", daemon=True)
+    thread.start()
+
+    def _stop() -> None:
+        stop.set()
+        thread.join(timeout=5)
+
+    return _stop
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from app.services import tag_events
+
+
+@dataclass(frozen=True, slots=True)
+class CachedTag:
+    id: uuid.UUID
+    slug: str
+    label: str
+    category: Any | None
+
+
+class TagCache:
+    """Read-through map of canonical tags by slug and by id.
+
+    Only taxonomy tags are kept; ``custom_*`` slugs are per-user noise and
+    would grow the cache without bound. Entries are dropped whenever
+    :mod:`tag_events` reports a catalog change, and ``put`` refuses rows read
+    under an older catalog version so a slow reader cannot repopulate the
+    cache with stale data after a clear.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_slug: dict[str, CachedTag] = {}
+        self._by_id: dict[uuid.UUID, CachedTag] = {}
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    def get_slugs(self, slugs: Iterable[str]) -> tuple[dict[str, CachedTag], list[str]]:
+        """Return ``(found, missing)`` for ``slugs``."""
+        found: dict[str, CachedTag] = {}
+        missing: list[str] = []
+        with self._lock:
+            for slug in slugs:
+                tag = self._by_slug.get(slug)
+                if tag is None:
+                    missing.append(slug)
+                else:
+                    found[slug] = tag
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def get_ids(self, ids: Iterable[uuid.UUID]) -> tuple[dict[uuid.UUID, CachedTag], list[uuid.UUID]]:
+        """Return ``(found, missing)`` for tag ``ids``."""
+        found: dict[uuid.UUID, CachedTag] = {}
+        missing: list[uuid.UUID] = []
+        with self._lock:
+            for tid in ids:
+                tag = self._by_id.get(tid)
+                if tag is None:
+                    missing.append(tid)
+                else:
+                    found[tid] = tag
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def put(self, rows: Iterable[Any], version: int) -> None:
+        """Cache canonical ``rows`` read while the catalog was at ``version``."""
+        with self._lock:
+            if version != tag_events.version():
+                self.stale_puts += 1
+                return
+            for row in rows:
+                if row.slug.startswith("custom_"):
+                    continue
+                tag = CachedTag(row.id, row.slug, row.label, row.category)
+                self._by_slug[tag.slug] = tag
+                self._by_id[tag.id] = tag
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_slug.clear()
+            self._by_id.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._by_slug),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "stale_puts": self.stale_puts,
+            }
+
+
+cache = TagCache()
+tag_events.subscribe(cache.clear)
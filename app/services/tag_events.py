@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import logging
+import select
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+logger = logging.getLogger("care_baby_ivy")
+
+CHANNEL = "tag_catalog"
+
+# Replaced rather than mutated, so notifying never sees a half-updated list
+_subscribers: tuple[Callable[[], None], ...] = ()
+_custom_subscribers: tuple[Callable[[], None], ...] = ()
+_lock = threading.Lock()
+_version = 0
+_stats: dict[str, Any] = {
+    "notifications": 0,
+    "custom_notifications": 0,
+    "listener_connected": False,
+    "last_lag_ms": None,
+    "max_lag_ms": 0.0,
+    "total_lag_ms": 0.0,
+}
+
+
+def subscribe(fn: Callable[[], None], custom_only: bool = False) -> Callable[[], None]:
+    """Register ``fn`` to run whenever the tag catalog changes.
+
+    With ``custom_only`` it runs instead for changes that only added
+    ``custom_*`` tags, which the other subscribers never see.
+    """
+    global _subscribers, _custom_subscribers
+    with _lock:
+        if custom_only:
+            _custom_subscribers = (*_custom_subscribers, fn)
+        else:
+            _subscribers = (*_subscribers, fn)
+    return fn
+
+
+def version() -> int:
+    """Process-local catalog version; bumped on every change notification."""
+    return _version
+
+
+def tags_changed(custom_only: bool = False) -> None:
+    """Tell in-process caches that tags were created, updated or deactivated.
+
+    ``custom_only`` changes only added custom tags: taxonomy-derived caches
+    stay valid, so the version is kept and only ``custom_only`` subscribers
+    run.
+    """
+    global _version
+    if custom_only:
+        for fn in _custom_subscribers:
+            fn()
+        return
+    with _lock:
+        _version += 1
+    for fn in _subscribers:
+        fn()
+
+
+def listening() -> bool:
+    """Whether the LISTEN connection is up, so no change can go unnoticed."""
+    return _stats["listener_connected"]
+
+
+def stats() -> dict:
+    with _lock:
+        out = dict(_stats)
+        out["version"] = _version
+    received = out.pop("total_lag_ms")
+    out["avg_lag_ms"] = received / out["notifications"] if out["notifications"] else None
+    return out
+
+
+def _on_notify(payload: str) -> None:
+    # "<epoch seconds>", plus " custom" when only custom tags were inserted
+    sent_at, _, kind = payload.partition(" ")
+    custom_only = kind == "custom"
+    try:
+        lag_ms: float | None = max(0.0, (time.time() - float(sent_at)) * 1000)
+    except ValueError:
+        lag_ms = None
+    with _lock:
+        _stats["notifications"] += 1
+        if custom_only:
+            _stats["custom_notifications"] += 1
+        if lag_ms is not None:
+            _stats["last_lag_ms"] = lag_ms
+            _stats["max_lag_ms"] = max(_stats["max_lag_ms"], lag_ms)
+            _stats["total_lag_ms"] += lag_ms
+    tags_changed(custom_only)
+
+
+def listen(
+    connect: Callable[[], Any],
+    stop: threading.Event,
+    poll_interval: float = 1.0,
+    retry_delay: float = 5.0,
+) -> None:
+    """LISTEN for catalog changes on a dedicated DBAPI connection until ``stop``.
+
+    Notifications can be missed while disconnected, so every (re)connect is
+    treated as a change.
+    """
+    while not stop.is_set():
+        conn = None
+        try:
+            conn = connect()
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            with _lock:
+                _stats["listener_connected"] = True
+            tags_changed()
+            while not stop.is_set():
+                if select.select([conn], [], [], poll_interval) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _on_notify(conn.notifies.pop(0).payload)
+        except Exception:
+            logger.warning("tag catalog listener disconnected", exc_info=True)
+            stop.wait(retry_delay)
+        finally:
+            with _lock:
+                _stats["listener_connected"] = False
+            if conn is not None:
+                try:
+                    conn.close()
+                except conn.Error:
+                    logger.debug("tag catalog listener: closing the connection failed", exc_info=True)
+
+
+def start_listener() -> Callable[[], None]:
+    """Start the LISTEN thread against the app database; returns a stop callback."""
+    from app.core.db import _engine
+
+    if _engine is None:
+        raise RuntimeError("DATABASE_URL is not configured.")
+    cargs, cparams = _engine.dialect.create_connect_args(_engine.url)
+    dbapi = _engine.dialect.loaded_dbapi
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=listen,
+        args=(lambda: dbapi.connect(*cargs, **cparams), stop),
+        name="tag-catalog-listener",
+        daemon=True,
+    )
+    thread.start()
+
+    def _stop() -> None:
+        stop.set()
+        thread.join(timeout=5)
+
+    return _stop
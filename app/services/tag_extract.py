@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import logging
+import string
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from itertools import accumulate
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.models.tag import Tag
+from app.services import synonyms as syn
+from app.services import tag_events
+from app.services.background import BackgroundBuilder
+from app.services.suggest_index import CATEGORY_ORDER, category_value
+
+logger = logging.getLogger("care_baby_ivy")
+
+# Punctuation and all Unicode whitespace become a plain space, one char for
+# one char, so offsets in the translated text are offsets in the input and
+# splitting it on " " accounts for every character.
+_SEPARATORS = str.maketrans(
+    dict.fromkeys(
+        string.punctuation
+        + string.whitespace
+        # the rest of str.isspace()
+        + "\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+        + "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+        + "\u2018\u2019\u201c\u201d\u2013\u2014\u2026",
+        " ",
+    )
+)
+
+
+def _lower(text: str) -> str:
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # A few characters lowercase to two; keep those as-is to preserve offsets
+        lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+    return lowered
+
+
+def _tokens(text: str) -> tuple[str, ...]:
+    return tuple(_lower(text).translate(_SEPARATORS).split())
+
+
+@dataclass(frozen=True)
+class ExtractAutomaton:
+    """Word-level Aho–Corasick automaton over tag labels and synonym keys.
+
+    Patterns are token sequences, so matches always start and end on word
+    boundaries. ``out[node]`` lists ``(length in tokens, slug)`` for every
+    pattern ending at ``node``, including those reached through failure
+    links, longest first.
+
+    A word outside the pattern ``vocab`` always sends the automaton back to
+    the root, so only vocabulary words need transitions.
+    """
+
+    goto: tuple[dict[str, int], ...]
+    fail: tuple[int, ...]
+    out: tuple[tuple[tuple[int, str], ...], ...]
+    patterns: Mapping[tuple[str, ...], str]
+    tags: Mapping[str, tuple[str, str | None]]
+    vocab: frozenset[str]
+
+    @classmethod
+    def build(
+        cls,
+        patterns: Mapping[tuple[str, ...], str],
+        tags: Mapping[str, tuple[str, str | None]],
+    ) -> ExtractAutomaton:
+        goto: list[dict[str, int]] = [{}]
+        own: list[tuple[int, str] | None] = [None]
+        for words, slug in patterns.items():
+            node = 0
+            for word in words:
+                nxt = goto[node].get(word)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][word] = nxt
+                    goto.append({})
+                    own.append(None)
+                node = nxt
+            own[node] = (len(words), slug)
+
+        # Breadth-first, so every failure target is finished before use
+        fail = [0] * len(goto)
+        out: list[tuple[tuple[int, str], ...]] = [()] * len(goto)
+        queue = list(goto[0].values())
+        for node in queue:
+            out[node] = ((own[node],) if own[node] else ()) + out[fail[node]]
+            for word, child in goto[node].items():
+                f = fail[node]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(word, 0)
+                queue.append(child)
+        vocab = frozenset(word for words in patterns for word in words)
+        return cls(tuple(goto), tuple(fail), tuple(out), patterns, tags, vocab)
+
+    def find(self, text: str) -> list[tuple[int, int, str]]:
+        """Leftmost-longest, non-overlapping ``(start, end, slug)`` character spans."""
+        goto, fail, out, vocab = self.goto, self.fail, self.out, self.vocab
+        # Every separator is one " ", so token j starts after the j tokens and
+        # j separators before it: offsets follow from token lengths alone.
+        tokens = _lower(text).translate(_SEPARATORS).split(" ")
+        if vocab.isdisjoint(tokens):
+            return []
+        hits: list[tuple[int, int, str]] = []
+        # Token positions of the vocabulary words read since the automaton
+        # last left the root; a pattern of n words ends with the last n.
+        run: list[int] = []
+        node = 0
+        for j, word in enumerate(tokens):
+            if word in vocab:
+                run.append(j)
+                while node and word not in goto[node]:
+                    node = fail[node]
+                node = goto[node].get(word, 0)
+                for length, slug in out[node]:
+                    hits.append((run[-length], j, slug))
+            elif word and node:
+                node = 0
+                run = []
+
+        hits.sort(key=lambda h: (h[0], h[0] - h[1]))
+        ends = list(accumulate(map(len, tokens)))
+        chosen = []
+        next_free = 0
+        for first, last, slug in hits:
+            if first >= next_free:
+                chosen.append((ends[first] - len(tokens[first]) + first, ends[last] + last, slug))
+                next_free = last + 1
+        return chosen
+
+
+def _patterns(
+    rows: Iterable, synmap: Mapping[str, str]
+) -> tuple[dict[tuple[str, ...], str], dict[str, tuple[str, str | None]]]:
+    """Canonical tag labels plus synonym keys; custom tags are left out.
+
+    Labels shared by several tags go to the best-ranked one, as in suggest.
+    """
+    tags: dict[str, tuple[str, str | None]] = {}
+    patterns: dict[tuple[str, ...], str] = {}
+    ranked = sorted(
+        ((row.slug, row.label, category_value(row.category)) for row in rows),
+        key=lambda t: (CATEGORY_ORDER.get(t[2], 9), len(t[1]), t[0]),
+    )
+    for slug, label, category in ranked:
+        if slug.startswith("custom_") or slug in tags:
+            continue
+        tags[slug] = (label, category)
+        words = _tokens(label)
+        if words:
+            patterns.setdefault(words, slug)
+    for key, slug in synmap.items():
+        words = _tokens(key)
+        if words and slug in tags:
+            patterns.setdefault(words, slug)
+    return patterns, tags
+
+
+_automaton: ExtractAutomaton | None = None
+
+
+def _taxonomy_rows() -> list:
+    # Only taxonomy tags become patterns, so custom tags are never read.
+    # Own session on the primary, independent of the suggest index.
+    if SessionLocal is None:
+        raise RuntimeError("DATABASE_URL is not configured.")
+    with SessionLocal() as db:
+        return db.execute(
+            select(Tag.slug, Tag.label, Tag.category).where(
+                Tag.active.is_(True), Tag.slug.not_like("custom\\_%", escape="\\")
+            )
+        ).all()
+
+
+def _load_automaton() -> ExtractAutomaton:
+    global _automaton
+    patterns, tags = _patterns(_taxonomy_rows(), syn._synonyms_map())
+    # Synonym reloads and the max-age timer also trigger rebuilds; keep the
+    # automaton unless its patterns really changed.
+    if _automaton is None or _automaton.patterns != patterns or _automaton.tags != tags:
+        _automaton = ExtractAutomaton.build(patterns, tags)
+    return _automaton
+
+
+builder: BackgroundBuilder[ExtractAutomaton] = BackgroundBuilder(
+    "tag-extract-builder",
+    _load_automaton,
+    lambda automaton: builder.age() > settings.suggest_index_max_age,
+    settings.suggest_index_rebuild_debounce,
+)
+tag_events.subscribe(builder.invalidate)
+
+
+def get_automaton() -> ExtractAutomaton:
+    """Automaton for the current taxonomy, as published by the background builder."""
+    return builder.get()
+
+
+def start_builder() -> Callable[[], None]:
+    """Build the automaton now, then keep it fresh in the background; returns a stop callback."""
+    try:
+        builder.refresh()
+    except Exception:
+        logger.warning("tag extract warm-up failed; the first extract builds it", exc_info=True)
+    return builder.start()
+
+
+def extract(automaton: ExtractAutomaton, text: str) -> dict:
+    matches = []
+    found: dict[str, dict] = {}
+    for start, end, slug in automaton.find(text):
+        matches.append({"slug": slug, "start": start, "end": end, "text": text[start:end]})
+        if slug not in found:
+            label, category = automaton.tags[slug]
+            found[slug] = {"slug": slug, "label": label, "category": category}
+    return {"tags": list(found.values()), "matches": matches}
+
@@ -1,30 +1,46 @@
 from __future__ import annotations
 
-import re
+import asyncio
 import uuid
-from typing import Iterable, Optional
-
-from sqlalchemy import delete, func, select
+from collections.abc import Iterable
+
+from sqlalchemy import (
+    JSON,
+    String,
+    and_,
+    any_,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.core.db import SessionLocal
+from app.core.config import settings
+from app.core.db import SessionLocal, is_replica
+from app.models.child import ChildProfile, coerce_user_id
 from app.models.tag import ChildTag, Tag
+from app.services import (
+    suggest_cache,
+    suggest_index,
+    tag_cache,
+    tag_events,
+    tag_extract,
+)
 from app.services import synonyms as syn
 
 
-_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
-
-CATEGORY_ORDER = {
-    "topic": 0,
-    "condition": 1,
-    "allergy": 2,
-    "age": 3,
-    "preference": 4,
-    "custom": 5,
-}
-
-
-def _ensure_session(db: Optional[Session]) -> Session:
+def _ensure_session(db: Session | None) -> Session:
     if db is not None:
         return db
     if SessionLocal is None:
@@ -32,111 +48,256 @@ def _ensure_session(db: Optional[Session]) -> Session:
     return SessionLocal()
 
 
-def _slugify(text: str) -> str:
-    s = text.strip().lower()
-    # For custom slugs, tests expect only [a-z0-9] after prefix.
-    s = _NON_ALNUM_RE.sub("", s)
-    return s or "x"
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _trgm_suggest_stmt(
+    qn: str,
+    limit: int,
+    syn_prefix: list[str],
+    syn_contains: list[str],
+    category: str | None = None,
+):
+    label_lower = func.lower(Tag.label)
+    escaped = _escape_like(qn)
+    prefix_label = label_lower.like(f"{escaped}%", escape="\\")
+    contains_label = label_lower.like(f"%{escaped}%", escape="\\")
+    prefix_syn = Tag.slug == any_(literal(syn_prefix, ARRAY(String)))
+    contains_syn = Tag.slug == any_(literal(syn_contains, ARRAY(String)))
+    priority = case(
+        (prefix_label, 0),
+        (prefix_syn, 1),
+        (contains_label, 2),
+        (contains_syn, 3),
+        else_=4,
+    )
+    ordering = (
+        priority,
+        func.similarity(label_lower, qn).desc(),
+        func.length(Tag.label),
+        Tag.slug,
+    )
+    stmt = (
+        select(
+            Tag.slug,
+            Tag.label,
+            Tag.category,
+            func.row_number().over(order_by=ordering).label("pos"),
+        )
+        .where(
+            Tag.active.is_(True),
+            or_(contains_label, label_lower.op("%")(qn), contains_syn),
+        )
+        .order_by(*ordering)
+        .limit(limit)
+    )
+    if category is not None:
+        stmt = stmt.where(cast(Tag.category, String) == category)
+    return stmt
+
+
+def _suggest_trgm(db: Session, items: list[tuple[str, int, str | None]]) -> list[list[dict]]:
+    """Rank every query in SQL, sharing one round trip across the batch."""
+    syn_snapshot = suggest_index.synonym_snapshot()
+    parts = []
+    for i, (qn, limit, category) in enumerate(items):
+        syn_prefix, syn_contains = syn_snapshot.synonym_hits(qn)
+        stmt = _trgm_suggest_stmt(qn, limit, sorted(syn_prefix), sorted(syn_contains), category)
+        parts.append(select(literal(i).label("qi"), stmt.subquery()))
+    stmt = parts[0] if len(parts) == 1 else union_all(*parts)
+    out: list[list[dict]] = [[] for _ in items]
+    for row in sorted(db.execute(stmt).all(), key=lambda r: (r.qi, r.pos)):
+        out[row.qi].append(
+            {
+                "slug": row.slug,
+                "label": row.label,
+                "category": suggest_index.category_value(row.category),
+            }
+        )
+    return out
 
 
-def suggest_from_text(db: Session, q: str, limit: int = 8) -> list[dict]:
-    q = q or ""
-    qn = syn.normalize(q)
+def _suggest_params(q: str | None, limit: int) -> tuple[str, int]:
+    qn = syn.normalize(q or "")
     if not qn or len(qn) < 2 or len(qn) > 40:
         raise ValueError("bad query length")
+    return qn, max(1, min(limit, 20))
 
-    limit = max(1, min(limit, 20))
 
-    like = f"%{qn}%"
-    stmt = (
-        select(Tag.slug, Tag.label, Tag.category)
-        .where(Tag.active.is_(True), func.lower(Tag.label).like(like))
-        .limit(200)
-    )
-    rows = db.execute(stmt).all()
-
-    synmap = syn._synonyms_map()
-    slug_synonyms: dict[str, list[str]] = {}
-    for key, slug in synmap.items():
-        slug_synonyms.setdefault(slug, []).append(key)
-
-    def _category_value(cat):
-        if cat is None:
-            return None
-        if hasattr(cat, "value"):
-            cat_val = cat.value  # type: ignore[attr-defined]
+def _suggest_many(db: Session, items: list[tuple[str, int, str | None]]) -> list[list[dict]]:
+    out: list[list[dict] | None] = [None] * len(items)
+    pending: list[int] = []
+    syn_state = syn.state()
+    for i, (qn, limit, category) in enumerate(items):
+        cached = suggest_cache.cache.get((settings.suggest_mode, syn_state.version, qn, limit, category))
+        if cached is None:
+            pending.append(i)
         else:
-            cat_val = str(cat)
-        return str(cat_val).lower()
-
-    by_slug: dict[str, dict] = {}
-    for row in rows:
-        slug = row.slug
-        if slug in by_slug:
+            out[i] = cached
+
+    if pending:
+        todo = [items[i] for i in pending]
+        cacheable = True
+        if settings.suggest_mode == "trgm":
+            version = tag_events.version()
+            fetched = _suggest_trgm(db, todo)
+            # A lagging replica's answer is served but never cached
+            cacheable = not is_replica(db)
+        else:
+            # The published snapshot may predate the latest catalog change or
+            # synonym reload while its replacement is built; results from it
+            # are served but not cached.
+            snapshot, version = suggest_index.builder.current()
+            fetched = [snapshot.search(qn, limit, category) for qn, limit, category in todo]
+            cacheable = snapshot.synmap is syn_state.mapping
+        for i, results in zip(pending, fetched, strict=True):
+            qn, limit, category = items[i]
+            if cacheable:
+                suggest_cache.cache.put(
+                    (settings.suggest_mode, syn_state.version, qn, limit, category), results, version
+                )
+            out[i] = results
+    return out  # type: ignore[return-value]
+
+
+def suggest_from_text(
+    db: Session, q: str, limit: int = 8, category: str | None = None
+) -> list[dict]:
+    qn, limit = _suggest_params(q, limit)
+    return _suggest_many(db, [(qn, limit, category)])[0]
+
+
+def suggest_batch(db: Session, queries: list[tuple[str, int, str | None]]) -> list[list[dict] | None]:
+    """Answer several ``(q, limit, category)`` queries with one candidate fetch.
+
+    Ranking matches ``suggest_from_text``; queries with an invalid length
+    yield ``None`` instead of failing the whole batch.
+    """
+    out: list[list[dict] | None] = [None] * len(queries)
+    valid: list[int] = []
+    items: list[tuple[str, int, str | None]] = []
+    for i, (q, limit, category) in enumerate(queries):
+        try:
+            qn, capped = _suggest_params(q, limit)
+        except ValueError:
             continue
-        by_slug[slug] = {
-            "slug": slug,
-            "label": row.label,
-            "category": _category_value(row.category),
-        }
-
-    syn_hits: set[str] = set()
-    for key, slug in synmap.items():
-        if qn in key:
-            syn_hits.add(slug)
-
-    missing_slugs = [s for s in syn_hits if s not in by_slug]
-    if missing_slugs:
-        syn_stmt = (
-            select(Tag.slug, Tag.label, Tag.category)
-            .where(Tag.active.is_(True), Tag.slug.in_(missing_slugs))
-        )
-        for row in db.execute(syn_stmt).all():
-            by_slug.setdefault(
-                row.slug,
-                {
-                    "slug": row.slug,
-                    "label": row.label,
-                    "category": _category_value(row.category),
-                },
+        valid.append(i)
+        items.append((qn, capped, category))
+    if items:
+        for i, results in zip(valid, _suggest_many(db, items), strict=True):
+            out[i] = results
+    return out
+
+
+def extract_from_text(db: Session, text: str) -> dict:
+    """Find taxonomy tags mentioned anywhere in free text, with character spans."""
+    return tag_extract.extract(tag_extract.get_automaton(), text)
+
+
+def _resolve_texts(local: Session, texts: Iterable[str], allow_custom: bool = True) -> dict:
+    """Map stripped, non-empty input texts to tag rows ``(id, slug, label, category)``.
+
+    Inputs are canonicalized in Python and canonical slugs are served from
+    :mod:`tag_cache`; the remaining candidate slugs are fetched with one
+    ``slug IN (...)`` query and missing custom tags are created with one
+    ``INSERT ... ON CONFLICT (slug) DO NOTHING RETURNING``. Texts that do not
+    resolve are left out.
+    """
+    plan = {text: syn.candidate_slugs(text) for text in texts}
+    if not plan:
+        return {}
+
+    columns = (Tag.id, Tag.slug, Tag.label, Tag.category)
+    cached, missing = tag_cache.cache.get_slugs({slug for slug, _ in plan.values() if slug is not None})
+    found: dict = dict(cached)
+    wanted = set(missing)
+    if allow_custom:
+        wanted.update(custom for slug, custom in plan.values() if slug is None or slug not in found)
+    if wanted:
+        version = tag_events.version()
+        fetched = local.execute(select(*columns).where(Tag.slug.in_(wanted))).all()
+        tag_cache.cache.put(fetched, version)
+        found.update((row.slug, row) for row in fetched)
+
+    if allow_custom:
+        new_labels: dict[str, str] = {}
+        for text, (slug, custom) in plan.items():
+            if (slug is None or slug not in found) and custom not in found:
+                new_labels.setdefault(custom, text)
+        if new_labels:
+            stmt = (
+                pg_insert(Tag.__table__)
+                .values(
+                    [
+                        {"id": uuid.uuid4(), "slug": slug, "label": label, "active": True}
+                        for slug, label in new_labels.items()
+                    ]
+                )
+                .on_conflict_do_nothing(index_elements=[Tag.__table__.c.slug])
+                .returning(*columns)
             )
+            for row in local.execute(stmt):
+                found[row.slug] = row
+            # Rows inserted concurrently by another transaction come back
+            # empty from DO NOTHING; read them once committed.
+            raced = [slug for slug in new_labels if slug not in found]
+            if raced:
+                for row in local.execute(select(*columns).where(Tag.slug.in_(raced))):
+                    found[row.slug] = row
+            # Caches refilled before the commit would miss the new tags
+            local.info["tags_changed"] = True
+
+    resolved = {}
+    for text, (slug, custom) in plan.items():
+        row = found.get(slug) if slug is not None else None
+        if row is None and allow_custom:
+            row = found.get(custom)
+        if row is not None:
+            resolved[text] = row
+    return resolved
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_tags_changed(session: Session) -> None:
+    # Also fires when a savepoint is released; wait for the real commit
+    if not session.in_nested_transaction() and session.info.pop("tags_changed", False):
+        # Only custom tags are ever inserted here
+        tag_events.tags_changed(custom_only=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_tags_changed(session: Session) -> None:
+    # Also fires when a savepoint rolls back; the outer transaction's
+    # inserts still commit then, so only the real rollback discards
+    if not session.in_nested_transaction():
+        session.info.pop("tags_changed", None)
+
+
+def _strip_inputs(inputs: Iterable[str]) -> list[str]:
+    return [text for text in ((raw or "").strip() for raw in inputs) if text]
+
+
+def _pick_rows(texts: Iterable[str], resolved: dict) -> list:
+    """Rows for ``texts`` in order, deduplicated by slug."""
+    rows = []
+    seen_slugs: set[str] = set()
+    for text in texts:
+        row = resolved.get(text)
+        if row is None or row.slug in seen_slugs:
+            continue
+        seen_slugs.add(row.slug)
+        rows.append(row)
+    return rows
 
-    items = list(by_slug.values())
-
-    def score(item: dict) -> tuple:
-        label_norm = syn.normalize(item["label"])
-        slug = item["slug"]
-        syn_keys = slug_synonyms.get(slug, [])
-
-        prefix_label = label_norm.startswith(qn)
-        prefix_syn = any(key.startswith(qn) for key in syn_keys)
-        contains_label = qn in label_norm
-        contains_syn = any(qn in key for key in syn_keys)
-
-        if prefix_label:
-            pri = 0
-        elif prefix_syn:
-            pri = 1
-        elif contains_label:
-            pri = 2
-        elif contains_syn:
-            pri = 3
-        else:
-            pri = 4
-
-        category = item.get("category")
-        return (
-            pri,
-            CATEGORY_ORDER.get(category, 9),
-            len(item["label"]),
-            slug,
-        )
 
-    items.sort(key=score)
-    return items[:limit]
+def _resolve_tags(local: Session, inputs: Iterable[str], allow_custom: bool = True) -> list:
+    """Resolve free-text inputs to tag rows, in input order and deduplicated by slug."""
+    texts = _strip_inputs(inputs)
+    return _pick_rows(texts, _resolve_texts(local, texts, allow_custom))
 
 
-def resolve_to_tag_ids(db_or_inputs, maybe_inputs: Optional[list[str]] = None, allow_custom: bool = True, *, db: Optional[Session] = None) -> list[uuid.UUID]:
+def resolve_to_tag_ids(db_or_inputs, maybe_inputs: list[str] | None = None, allow_custom: bool = True, *, db: Session | None = None) -> list[uuid.UUID]:
     # Support call styles: (inputs) or (db, inputs)
     if isinstance(db_or_inputs, Session):
         db = db_or_inputs
@@ -149,49 +310,64 @@ def resolve_to_tag_ids(db_or_inputs, maybe_inputs: Optional[list[str]] = None, a
     local = _ensure_session(db)
     should_close = db is None
     try:
-        resolved_ids: list[uuid.UUID] = []
-        seen_slugs: set[str] = set()
-
-        for raw in inputs:
-            text = (raw or "").strip()
-            if not text:
-                continue
-
-            slug = syn.canonicalize(text)
-            if slug is None:
-                # Also try direct slug match if user entered a slug
-                possible = _slugify(text)
-                # Preserve given slug exactly if already looks like one
-                if text == possible:
-                    slug = possible
-
-            tag_obj: Optional[Tag] = None
-            if slug is not None:
-                tag_obj = local.execute(select(Tag).where(Tag.slug == slug)).scalar_one_or_none()
-
-            if tag_obj is None and allow_custom:
-                custom_slug = f"custom_{_slugify(text)}"
-                tag_obj = local.execute(select(Tag).where(Tag.slug == custom_slug)).scalar_one_or_none()
-                if tag_obj is None:
-                    tag_obj = Tag(slug=custom_slug, label=text, active=True)
-                    local.add(tag_obj)
-                    local.flush()
-
-            if tag_obj is None:
-                continue
-
-            if tag_obj.slug in seen_slugs:
-                continue
-            seen_slugs.add(tag_obj.slug)
-            resolved_ids.append(tag_obj.id)
-
-        return resolved_ids
+        return [row.id for row in _resolve_tags(local, inputs, allow_custom)]
     finally:
         if should_close:
             local.close()
 
 
-def child_set_tags(db_or_child_id, maybe_child_id: Optional[str] = None, tag_inputs: Optional[list[str]] = None, *, db: Optional[Session] = None) -> list[dict]:
+_PAIR_CHUNK = 5000
+
+
+def _apply_tag_diffs(
+    local: Session,
+    current: dict[uuid.UUID, set[uuid.UUID]],
+    wanted: dict[uuid.UUID, list[uuid.UUID]],
+) -> None:
+    """Write only the ``(child_id, tag_id)`` pairs that change, for any number
+    of children, and bump ``updated_at`` of the children whose set changed so
+    incremental exports pick them up. An unchanged set issues no statements."""
+    removed: list[tuple[uuid.UUID, uuid.UUID]] = []
+    added: list[dict] = []
+    changed: list[uuid.UUID] = []
+    for cid, wanted_ids in wanted.items():
+        have = current.get(cid, set())
+        keep = set(wanted_ids)
+        n = len(removed) + len(added)
+        removed.extend((cid, tid) for tid in have - keep)
+        added.extend({"child_id": cid, "tag_id": tid} for tid in wanted_ids if tid not in have)
+        if len(removed) + len(added) != n:
+            changed.append(cid)
+    # Chunked to stay well below the 65535 bind-parameter limit
+    for i in range(0, len(removed), _PAIR_CHUNK):
+        local.execute(
+            delete(ChildTag).where(
+                tuple_(ChildTag.child_id, ChildTag.tag_id).in_(removed[i : i + _PAIR_CHUNK])
+            )
+        )
+    for i in range(0, len(added), _PAIR_CHUNK):
+        local.execute(
+            pg_insert(ChildTag.__table__).values(added[i : i + _PAIR_CHUNK]).on_conflict_do_nothing()
+        )
+    for i in range(0, len(changed), _PAIR_CHUNK):
+        local.execute(
+            update(ChildProfile.__table__)
+            .where(ChildProfile.id.in_(changed[i : i + _PAIR_CHUNK]))
+            .values(updated_at=func.now())
+        )
+
+
+def _current_tag_ids(local: Session, child_ids: Iterable[uuid.UUID]) -> dict[uuid.UUID, set[uuid.UUID]]:
+    current: dict[uuid.UUID, set[uuid.UUID]] = {}
+    pairs = local.execute(
+        select(ChildTag.child_id, ChildTag.tag_id).where(ChildTag.child_id.in_(set(child_ids)))
+    )
+    for cid, tid in pairs:
+        current.setdefault(cid, set()).add(tid)
+    return current
+
+
+def child_set_tags(db_or_child_id, maybe_child_id: str | None = None, tag_inputs: list[str] | None = None, *, db: Session | None = None) -> list[dict]:
     # Support call styles: (child_id, tag_inputs) or (db, child_id, tag_inputs)
     if isinstance(db_or_child_id, Session):
         db = db_or_child_id
@@ -207,62 +383,162 @@ def child_set_tags(db_or_child_id, maybe_child_id: Optional[str] = None, tag_inp
         # Use a nested transaction if the caller already manages one
         tx_ctx = local.begin_nested() if local.in_transaction() else local.begin()
         with tx_ctx:
-            # Ensure compatibility views exist for tests
-            from sqlalchemy import text as _text
-            local.execute(_text("CREATE OR REPLACE VIEW tags AS SELECT * FROM tag"))
-            local.execute(_text("CREATE OR REPLACE VIEW child_tags AS SELECT * FROM child_tag"))
-
-            # Check if child already has tags
-            existing_count = local.execute(
-                select(func.count()).select_from(ChildTag).where(ChildTag.child_id == cid)
-            ).scalar_one()
-
-            def _resolve_inline(inputs: Iterable[str]) -> list[uuid.UUID]:
-                result: list[uuid.UUID] = []
-                seen: set[str] = set()
-                for raw in inputs:
-                    text_in = (raw or "").strip()
-                    if not text_in:
-                        continue
-                    slug = syn.canonicalize(text_in)
-                    if slug is None:
-                        possible = _slugify(text_in)
-                        if text_in == possible:
-                            slug = possible
-                    tag_obj: Optional[Tag] = None
-                    if slug is not None:
-                        tag_obj = local.execute(select(Tag).where(Tag.slug == slug)).scalar_one_or_none()
-                    if tag_obj is None:
-                        custom_slug = f"custom_{_slugify(text_in)}"
-                        tag_obj = local.execute(select(Tag).where(Tag.slug == custom_slug)).scalar_one_or_none()
-                        if tag_obj is None:
-                            tag_obj = Tag(slug=custom_slug, label=text_in, active=True)
-                            local.add(tag_obj)
-                            local.flush()
-                    if tag_obj.slug in seen:
-                        continue
-                    seen.add(tag_obj.slug)
-                    result.append(tag_obj.id)
-                return result
-
-            # On first set (no existing tags), resolve inline to avoid external dependency
-            if existing_count == 0:
-                tag_ids = _resolve_inline(tag_inputs)
-            else:
-                tag_ids = resolve_to_tag_ids(local, tag_inputs, allow_custom=True)
-
-            # Clear existing relations
-            local.execute(delete(ChildTag).where(ChildTag.child_id == cid))
-
-            # Insert new set (deduped by resolve_to_tag_ids)
-            for tid in tag_ids:
-                local.add(ChildTag(child_id=cid, tag_id=tid))
-
-        if not tag_ids:
-            return []
-
-        rows = local.execute(select(Tag).where(Tag.id.in_(tag_ids))).scalars().all()
-        return [{"slug": t.slug, "label": t.label, "category": None} for t in rows]
+            current = _current_tag_ids(local, [cid])
+            rows = _resolve_tags(local, tag_inputs, allow_custom=True)
+            _apply_tag_diffs(local, current, {cid: [row.id for row in rows]})
+
+        return [{"slug": row.slug, "label": row.label, "category": None} for row in rows]
     finally:
         if should_close:
             local.close()
+
+
+def children_set_tags(db: Session, assignments: dict[uuid.UUID, list[str]]) -> dict[uuid.UUID, list[dict]]:
+    """Replace the tags of several children in one transaction.
+
+    The union of all inputs is resolved once, then every child's diff is
+    written with set-based DELETE/INSERT statements. Returns the normalized
+    tags per child, in the same shape as :func:`child_set_tags`.
+    """
+    texts = {cid: _strip_inputs(inputs) for cid, inputs in assignments.items()}
+    tx_ctx = db.begin_nested() if db.in_transaction() else db.begin()
+    with tx_ctx:
+        current = _current_tag_ids(db, texts)
+        resolved = _resolve_texts(db, dict.fromkeys(t for ts in texts.values() for t in ts))
+        rows = {cid: _pick_rows(ts, resolved) for cid, ts in texts.items()}
+        _apply_tag_diffs(db, current, {cid: [row.id for row in rs] for cid, rs in rows.items()})
+    return {
+        cid: [{"slug": row.slug, "label": row.label, "category": None} for row in rs]
+        for cid, rs in rows.items()
+    }
+
+
+def _tag_details(db: Session, tag_ids: Iterable[uuid.UUID]) -> dict:
+    """Tag rows by id, from :mod:`tag_cache` plus one query for the misses."""
+    found, missing = tag_cache.cache.get_ids(tag_ids)
+    if missing:
+        version = tag_events.version()
+        fetched = db.execute(
+            select(Tag.id, Tag.slug, Tag.label, Tag.category).where(Tag.id.in_(missing))
+        ).all()
+        if not is_replica(db):
+            tag_cache.cache.put(fetched, version)
+        found.update((row.id, row) for row in fetched)
+    return found
+
+
+def child_get_tags(db: Session, child_id) -> list[dict]:
+    """Current tags of a child; tag details come from :mod:`tag_cache` where possible."""
+    cid = uuid.UUID(str(child_id))
+    tag_ids = list(db.execute(select(ChildTag.tag_id).where(ChildTag.child_id == cid)).scalars())
+    found = _tag_details(db, tag_ids)
+    return [
+        {"slug": found[tid].slug, "label": found[tid].label, "category": None}
+        for tid in tag_ids
+        if tid in found
+    ]
+
+
+def owned_child_tags(db: Session, child_id: uuid.UUID, user_id) -> tuple[bool, list[dict]] | None:
+    """Ownership check and tags of one child in a single statement.
+
+    Returns ``None`` for an unknown child, otherwise ``(owned, tags)``; tags
+    are aggregated only for the owner, so nothing else leaves the database
+    on a forbidden read.
+    """
+    owned = ChildProfile.user_id == coerce_user_id(user_id)
+    tags = func.json_agg(
+        aggregate_order_by(func.json_build_object("slug", Tag.slug, "label", Tag.label), Tag.slug),
+        type_=JSON,
+    ).filter(and_(Tag.id.is_not(None), owned))
+    row = db.execute(
+        select(owned.label("owned"), tags.label("tags"))
+        .select_from(ChildProfile)
+        .outerjoin(ChildTag, ChildTag.child_id == ChildProfile.id)
+        .outerjoin(Tag, Tag.id == ChildTag.tag_id)
+        .where(ChildProfile.id == child_id)
+        .group_by(ChildProfile.id)
+    ).one_or_none()
+    if row is None:
+        return None
+    return row.owned, [{**t, "category": None} for t in row.tags or ()]
+
+
+def children_get_tags(db: Session, child_ids: Iterable[uuid.UUID]) -> dict:
+    """Owners and tags of several children in a constant number of queries.
+
+    Returns ``{child_id: (user_id, [tag dict, ...])}``; unknown ids are absent.
+    """
+    pairs = db.execute(
+        select(ChildProfile.id, ChildProfile.user_id, ChildTag.tag_id)
+        .outerjoin(ChildTag, ChildTag.child_id == ChildProfile.id)
+        .where(ChildProfile.id.in_(set(child_ids)))
+    ).all()
+    found = _tag_details(db, {p.tag_id for p in pairs if p.tag_id is not None})
+    out: dict = {}
+    for cid, owner, tid in pairs:
+        _, tags = out.setdefault(cid, (owner, []))
+        if tid in found:
+            tag = found[tid]
+            tags.append({"slug": tag.slug, "label": tag.label, "category": None})
+    return out
+
+
+# Async equivalents for routes on an AsyncSession. Each runs the sync
+# implementation above through ``run_sync``: the statements go over asyncpg
+# without holding a threadpool thread, and both code paths stay identical.
+# run_sync executes on the event loop thread, so work that never touches the
+# database but can take a while runs in a worker thread instead.
+
+
+async def suggest_from_text_async(
+    db: AsyncSession, q: str, limit: int = 8, category: str | None = None
+) -> list[dict]:
+    if settings.suggest_mode == "trgm":
+        return await db.run_sync(suggest_from_text, q, limit, category)
+    # The in-memory index never uses the session; searching it is CPU-bound
+    return await asyncio.to_thread(suggest_from_text, db.sync_session, q, limit, category)
+
+
+async def suggest_batch_async(
+    db: AsyncSession, queries: list[tuple[str, int, str | None]]
+) -> list[list[dict] | None]:
+    if settings.suggest_mode == "trgm":
+        return await db.run_sync(suggest_batch, queries)
+    return await asyncio.to_thread(suggest_batch, db.sync_session, queries)
+
+
+async def extract_from_text_async(db: AsyncSession, text: str) -> dict:
+    # A cold automaton is built in a worker thread, not on the event loop
+    await tag_extract.builder.ensure_async()
+    return await db.run_sync(extract_from_text, text)
+
+
+async def resolve_to_tag_ids_async(
+    db: AsyncSession, inputs: list[str], allow_custom: bool = True
+) -> list[uuid.UUID]:
+    return await db.run_sync(resolve_to_tag_ids, inputs, allow_custom)
+
+
+async def child_set_tags_async(db: AsyncSession, child_id, tag_inputs: list[str]) -> list[dict]:
+    return await db.run_sync(child_set_tags, child_id, tag_inputs)
+
+
+async def children_set_tags_async(
+    db: AsyncSession, assignments: dict[uuid.UUID, list[str]]
+) -> dict[uuid.UUID, list[dict]]:
+    return await db.run_sync(children_set_tags, assignments)
+
+
+async def child_get_tags_async(db: AsyncSession, child_id) -> list[dict]:
+    return await db.run_sync(child_get_tags, child_id)
+
+
+async def owned_child_tags_async(
+    db: AsyncSession, child_id: uuid.UUID, user_id
+) -> tuple[bool, list[dict]] | None:
+    return await db.run_sync(owned_child_tags, child_id, user_id)
+
+
+async def children_get_tags_async(db: AsyncSession, child_ids: Iterable[uuid.UUID]) -> dict:
+    return await db.run_sync(children_get_tags, child_ids)
@@ -0,0 +1,196 @@
+"""Compiled synonyms: synonyms.json as one flat, sorted file.
+
+The file is opened with ``mmap`` so every worker on a host shares the same
+pages; lookups binary-search the sorted tables in place and decode only the
+strings they return. ``scripts/build_taxonomy.py`` writes it. Tags are not
+included: the database is their source of truth.
+
+Layout (little-endian ``u32`` unless noted)::
+
+    header    magic, format, sha256(synonyms.json),
+              (offset, length) of each section below
+    strings   interned UTF-8 slugs, sorted
+    str_offs  start of string i in ``strings``; one extra entry for the end
+    keys      normalized synonym keys, sorted, each followed by a NUL byte
+    key_offs  start of key i in ``keys``; one extra entry for the end
+    key_slug  string id of the slug for key i
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import mmap
+import struct
+import sys
+from collections.abc import ItemsView, Iterable, Iterator, Mapping
+from pathlib import Path
+
+ARTIFACT_PATH = Path(__file__).resolve().parents[2] / "taxonomy" / "taxonomy.bin"
+
+MAGIC = b"CBTX"
+FORMAT = 2
+_SECTIONS = ("strings", "str_offs", "keys", "key_offs", "key_slug")
+_HEADER = struct.Struct("<4sI32s" + "II" * len(_SECTIONS))
+
+
+def digest(raw: bytes) -> bytes:
+    return hashlib.sha256(raw).digest()
+
+
+def _u32(values: Iterable[int]) -> bytes:
+    values = list(values)
+    return struct.pack(f"<{len(values)}I", *values)
+
+
+def build(synonyms: Mapping[str, str], synonyms_digest: bytes) -> bytes:
+    """Serialize an already-normalized synonym map."""
+    strings = sorted({s.encode() for s in synonyms.values()})
+    ids = {s.decode(): i for i, s in enumerate(strings)}
+    keys = sorted((k.encode(), ids[v]) for k, v in synonyms.items())
+    if any(b"\0" in k for k, _ in keys):
+        raise ValueError("synonym keys must not contain NUL")
+
+    sections = {
+        "strings": b"".join(strings),
+        "str_offs": _u32(_offsets(len(s) for s in strings)),
+        "keys": b"".join(k + b"\0" for k, _ in keys),
+        "key_offs": _u32(_offsets(len(k) + 1 for k, _ in keys)),
+        "key_slug": _u32(sid for _, sid in keys),
+    }
+    body = bytearray()
+    table = []
+    for name in _SECTIONS:
+        # Keep every section 4-byte aligned for the u32 views
+        body += b"\0" * (-(_HEADER.size + len(body)) % 4)
+        table += [_HEADER.size + len(body), len(sections[name])]
+        body += sections[name]
+    return _HEADER.pack(MAGIC, FORMAT, synonyms_digest, *table) + body
+
+
+def _offsets(lengths: Iterable[int]) -> Iterator[int]:
+    pos = 0
+    yield pos
+    for n in lengths:
+        pos += n
+        yield pos
+
+
+class Artifact:
+    """A mapped taxonomy file; keep a reference for as long as its tables are used."""
+
+    def __init__(self, path: Path) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("taxonomy artifact is little-endian only")
+        with path.open("rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < _HEADER.size:
+            raise ValueError(f"{path} is truncated")
+        magic, fmt, self.synonyms_digest, *table = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or fmt != FORMAT:
+            raise ValueError(f"{path} is not a format {FORMAT} taxonomy artifact")
+        view = memoryview(self._mm)
+        sec = {}
+        for i, name in enumerate(_SECTIONS):
+            offset, length = table[2 * i], table[2 * i + 1]
+            if offset + length > len(self._mm):
+                raise ValueError(f"{path} is truncated")
+            sec[name] = view[offset : offset + length]
+        self._strings = sec["strings"]
+        self._str_offs = sec["str_offs"].cast("I")
+        self.synonyms = SynonymTable(
+            self, table[4], sec["keys"], sec["key_offs"].cast("I"), sec["key_slug"].cast("I")
+        )
+
+    def string(self, sid: int) -> str:
+        return str(self._strings[self._str_offs[sid] : self._str_offs[sid + 1]], "utf-8")
+
+
+class _KeyView:
+    """Sequence of encoded keys, for ``bisect``."""
+
+    def __init__(self, blob: memoryview, offs: memoryview) -> None:
+        self._blob = blob
+        self._offs = offs
+
+    def __len__(self) -> int:
+        return len(self._offs) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        return bytes(self._blob[self._offs[i] : self._offs[i + 1] - 1])
+
+
+class _SynonymItems(ItemsView):
+    def __iter__(self) -> Iterator[tuple[str, str]]:
+        table: SynonymTable = self._mapping  # type: ignore[assignment]
+        for i in range(len(table)):
+            yield table._keys[i].decode(), table._artifact.string(table._slugs[i])
+
+
+class SynonymTable(Mapping[str, str]):
+    """Read-only ``normalized key -> slug`` map over the artifact's key table."""
+
+    def __init__(
+        self, artifact: Artifact, start: int, blob: memoryview, offs: memoryview, slugs: memoryview
+    ) -> None:
+        self._artifact = artifact
+        self._start = start
+        self._keys = _KeyView(blob, offs)
+        self._offs = offs
+        self._slugs = slugs
+
+    def _index(self, key: str) -> int:
+        target = key.encode()
+        i = bisect.bisect_left(self._keys, target)
+        if i < len(self._keys) and self._keys[i] == target:
+            return i
+        return -1
+
+    def __getitem__(self, key: str) -> str:
+        i = self._index(key) if isinstance(key, str) else -1
+        if i < 0:
+            raise KeyError(key)
+        return self._artifact.string(self._slugs[i])
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._index(key) >= 0
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(len(self._keys)):
+            yield self._keys[i].decode()
+
+    def items(self) -> _SynonymItems:
+        return _SynonymItems(self)
+
+    def synonym_hits(self, qn: str) -> tuple[set[str], set[str]]:
+        """Slugs whose keys start with / contain ``qn``, like ``SuggestSnapshot.synonym_hits``."""
+        target = qn.encode()
+        if b"\0" in target:
+            return set(), set()
+        string, slugs, keys = self._artifact.string, self._slugs, self._keys
+        lo = bisect.bisect_left(keys, target)
+        hi = lo
+        while hi < len(keys) and keys[hi].startswith(target):
+            hi += 1
+        prefix = {string(slugs[i]) for i in range(lo, hi)}
+        # Substring search runs over the NUL-separated key blob in the mapping
+        contains = set()
+        mm, start, offs = self._artifact._mm, self._start, self._offs
+        end = start + offs[len(keys)]
+        pos = mm.find(target, start, end) if target else -1
+        while pos >= 0:
+            i = bisect.bisect_right(offs, pos - start) - 1
+            contains.add(string(slugs[i]))
+            pos = mm.find(target, start + offs[i + 1], end)
+        return prefix, contains
+
+
+def load(path: Path | None = None) -> Artifact | None:
+    """The artifact at ``path``, or None if there is none or it is unreadable."""
+    try:
+        return Artifact(path or ARTIFACT_PATH)
+    except (OSError, ValueError, struct.error):
+        return None
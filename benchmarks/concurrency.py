@@ -0,0 +1,217 @@
+"""Sustained-concurrency benchmark: sync Session vs AsyncSession.
+
+Runs the same tagging service calls for ``--duration`` seconds with
+``--workers`` threads on the sync engine, then with as many asyncio tasks on
+the asyncpg engine, and prints one JSON document with throughput and latency
+percentiles per stack and scenario::
+
+    python benchmarks/concurrency.py --workers 32 --duration 10 -o concurrency.json
+
+Local Postgres answers in microseconds, which hides what async buys;
+``--db-latency-ms`` adds a ``pg_sleep`` round trip per operation to stand in
+for a database across the network.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy import delete, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import db as core_db
+from app.models.child import ChildProfile, coerce_user_id
+from app.services import tagging
+from benchmarks.load import _commit, summarize
+from scripts.generate_children import TagSampler
+
+BENCH_USER = "bench-concurrency"
+SCENARIOS = ("suggest", "get_tags", "set_tags", "create_child")
+
+
+class Workload:
+    """Inputs shared by both stacks, drawn from one seeded sampler."""
+
+    def __init__(self, seed: int, children: list[uuid.UUID], latency_ms: float) -> None:
+        self.rng = random.Random(seed)
+        self.sampler = TagSampler(self.rng, custom_rate=0)
+        self.children = children
+        self.latency = text("SELECT pg_sleep(:s)").bindparams(s=latency_ms / 1000) if latency_ms else None
+
+    def query(self) -> str:
+        term = self.sampler.term()
+        return term[: self.rng.randint(2, min(len(term), 8))] if len(term) > 2 else term + "s"
+
+    def child(self) -> uuid.UUID:
+        return self.rng.choice(self.children)
+
+    def tags(self) -> list[str]:
+        return self.sampler.sample(self.rng.randint(1, 8))
+
+
+def sync_op(name: str, work: Workload) -> Callable[[Session], None]:
+    def op(db: Session) -> None:
+        if work.latency is not None:
+            db.execute(work.latency)
+        if name == "suggest":
+            tagging.suggest_from_text(db, work.query())
+        elif name == "get_tags":
+            tagging.child_get_tags(db, work.child())
+        elif name == "set_tags":
+            tagging.child_set_tags(db, work.child(), work.tags())
+        else:
+            db.add(ChildProfile(user_id=BENCH_USER, name="Bench", region="US"))
+        db.commit()
+
+    return op
+
+
+def async_op(name: str, work: Workload) -> Callable[[AsyncSession], Awaitable[None]]:
+    async def op(db: AsyncSession) -> None:
+        if work.latency is not None:
+            await db.execute(work.latency)
+        if name == "suggest":
+            await tagging.suggest_from_text_async(db, work.query())
+        elif name == "get_tags":
+            await tagging.child_get_tags_async(db, work.child())
+        elif name == "set_tags":
+            await tagging.child_set_tags_async(db, work.child(), work.tags())
+        else:
+            db.add(ChildProfile(user_id=BENCH_USER, name="Bench", region="US"))
+        await db.commit()
+
+    return op
+
+
+def run_threads(workers: int, duration: float, op: Callable[[Session], None]) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    def worker() -> None:
+        nonlocal errors
+        with core_db.SessionLocal() as db:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    op(db)
+                except SQLAlchemyError:
+                    db.rollback()
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_tasks(workers: int, duration: float, op: Callable[[AsyncSession], Awaitable[None]]) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        async with AsyncSession(core_db.get_async_engine(), autoflush=False, expire_on_commit=False) as db:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    await op(db)
+                except SQLAlchemyError:
+                    await db.rollback()
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - start
+    await core_db.dispose_async_engine()
+    return summarize(latencies, errors, elapsed)
+
+
+def _setup(count: int) -> list[uuid.UUID]:
+    with core_db.SessionLocal() as db:
+        kids = [ChildProfile(user_id=BENCH_USER, name=f"Bench {i}", region="US") for i in range(count)]
+        db.add_all(kids)
+        db.commit()
+        return [k.id for k in kids]
+
+
+def _cleanup() -> None:
+    with core_db.SessionLocal() as db:
+        db.execute(delete(ChildProfile).where(ChildProfile.user_id == coerce_user_id(BENCH_USER)))
+        db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare sync and async database stacks at equal worker counts."
+    )
+    parser.add_argument("--workers", type=int, default=32, help="threads (sync) and tasks (async)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per stack and scenario")
+    parser.add_argument("--children", type=int, default=200)
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="simulated round trip per operation")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable; default: all")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", type=Path, help="default: stdout")
+    args = parser.parse_args()
+
+    if core_db.SessionLocal is None:
+        raise SystemExit("DATABASE_URL is not configured.")
+
+    results: dict[str, dict] = {}
+    try:
+        children = _setup(args.children)
+        for name in args.scenario or SCENARIOS:
+            work = Workload(args.seed, children, args.db_latency_ms)
+            sync_stats = run_threads(args.workers, args.duration, sync_op(name, work))
+            work = Workload(args.seed, children, args.db_latency_ms)
+            async_stats = asyncio.run(run_tasks(args.workers, args.duration, async_op(name, work)))
+            results[name] = {"sync": sync_stats, "async": async_stats}
+            for stack, stats in results[name].items():
+                print(f"{name}/{stack}: {json.dumps(stats)}", file=sys.stderr)
+    finally:
+        _cleanup()
+
+    doc = {
+        "meta": {
+            "commit": _commit(),
+            "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "workers": args.workers,
+            "duration": args.duration,
+            "db_latency_ms": args.db_latency_ms,
+            "seed": args.seed,
+        },
+        "scenarios": results,
+    }
+    text_out = json.dumps(doc, indent=2)
+    if args.output:
+        args.output.write_text(text_out + "\n", encoding="utf-8")
+    else:
+        print(text_out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""End-to-end load benchmark for the tag API.
+
+Drives the app in-process through httpx's ASGI transport (default) or a
+running server (``--base-url``) and prints one JSON document with
+throughput, latency percentiles and process CPU time per request for
+each scenario::
+
+    python benchmarks/load.py --requests 2000 --concurrency 32 -o load.json
+
+Populate the database first for production-like numbers::
+
+    python scripts/generate_children.py --users 100000 -o children.ndjson
+    python scripts/import_children.py children.ndjson
+
+In-process, ``cpu_ms_per_request`` covers the client and the app together;
+the client's share is the same between runs, so differences are the app's.
+``put_children_tags`` sends all of one user's children (up to
+``--bulk-size``) per request and also reports ``children_per_s``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+import httpx
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from scripts.generate_children import TagSampler
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float, cpu: float | None = None) -> dict:
+    done = len(latencies)
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if done > 1 else latencies * 99
+    return {
+        "requests": done,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(done / elapsed, 1) if elapsed else None,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 3) if done else None,
+        "p50_ms": round(cuts[49] * 1000, 3) if done else None,
+        "p95_ms": round(cuts[94] * 1000, 3) if done else None,
+        "p99_ms": round(cuts[98] * 1000, 3) if done else None,
+        "cpu_ms_per_request": round(cpu / done * 1000, 3) if cpu is not None and done else None,
+    }
+
+
+async def run_scenario(
+    requests: int, concurrency: int, call: Callable[[int], Awaitable[httpx.Response]]
+) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            response = await call(i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    start, cpu_start = time.perf_counter(), time.process_time()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start, time.process_time() - cpu_start)
+
+
+async def run(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    sampler = TagSampler(rng, custom_rate=args.custom_rate)
+    users = [str(uuid.UUID(int=rng.getrandbits(128), version=4)) for _ in range(args.users)]
+    children: list[tuple[str, str]] = []
+
+    async def create_child(i: int) -> httpx.Response:
+        user = users[i % len(users)]
+        response = await client.post(
+            "/api/v1/children", headers={"X-User-Id": user}, json={"name": f"Load {i}", "region": "US"}
+        )
+        if response.status_code == 200:
+            children.append((response.json()["id"], user))
+        return response
+
+    def query() -> str:
+        term = sampler.term()
+        return term[: rng.randint(2, min(len(term), 8))] if len(term) > 2 else term + "s"
+
+    async def suggest(i: int) -> httpx.Response:
+        return await client.get("/api/v1/tags/suggest", params={"q": query(), "limit": 8})
+
+    async def put_tags(i: int) -> httpx.Response:
+        cid, user = rng.choice(children)
+        tags = sampler.sample(rng.randint(1, 8))
+        return await client.put(
+            f"/api/v1/children/{cid}/tags", headers={"X-User-Id": user}, json={"tags": tags}
+        )
+
+    async def get_tags(i: int) -> httpx.Response:
+        cid, user = rng.choice(children)
+        return await client.get(f"/api/v1/children/{cid}/tags", headers={"X-User-Id": user})
+
+    by_user: dict[str, list[str]] = {}
+    children_written = 0
+
+    async def put_children_tags(i: int) -> httpx.Response:
+        nonlocal children_written
+        user = rng.choice(list(by_user))
+        batch = {cid: sampler.sample(rng.randint(1, 8)) for cid in by_user[user][: args.bulk_size]}
+        response = await client.put(
+            "/api/v1/children/tags", headers={"X-User-Id": user}, json={"children": batch}
+        )
+        if response.status_code == 200:
+            children_written += len(batch)
+        return response
+
+    # create_child always runs first: the tag scenarios need its children
+    results = {"create_child": await run_scenario(args.children, args.concurrency, create_child)}
+    if not children:
+        raise SystemExit("no children were created; is the database migrated and reachable?")
+    for cid, user in children:
+        by_user.setdefault(user, []).append(cid)
+    scenarios = (
+        ("suggest", suggest),
+        ("put_tags", put_tags),
+        ("get_tags", get_tags),
+        ("put_children_tags", put_children_tags),
+    )
+    for name, call in scenarios:
+        if not args.scenario or name in args.scenario:
+            results[name] = await run_scenario(args.requests, args.concurrency, call)
+    if "put_children_tags" in results:
+        stats = results["put_children_tags"]
+        per_request = children_written / stats["requests"] if stats["requests"] else 0
+        rps = stats["throughput_rps"]
+        stats["children_per_s"] = round(rps * per_request, 1) if rps is not None else None
+    for name, stats in results.items():
+        print(f"{name}: {json.dumps(stats)}", file=sys.stderr)
+    return results
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    meta = {
+        "commit": _commit(),
+        "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "target": args.base_url or "asgi",
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+    }
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+            return {"meta": meta, "scenarios": await run(client, args)}
+
+    from app.main import app
+
+    # Run the lifespan too, so invalidation listeners behave as in production
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=30) as client:
+            return {"meta": meta, "scenarios": await run(client, args)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the tag API and report latencies as JSON.")
+    parser.add_argument("--base-url", help="e.g. http://localhost:8000; default: in-process ASGI")
+    parser.add_argument("--requests", type=int, default=1000, help="per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--children", type=int, default=200, help="created through POST /children")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument(
+        "--bulk-size", type=int, default=100, help="max children per put_children_tags request"
+    )
+    parser.add_argument("--custom-rate", type=float, default=0.05)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=("suggest", "put_tags", "get_tags", "put_children_tags"),
+        help="repeatable; default: all. create_child always runs to set up children",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", type=Path, help="default: stdout")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    text = json.dumps(result, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
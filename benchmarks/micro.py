@@ -0,0 +1,314 @@
+"""Microbenchmarks for the tagging and synonym hot paths.
+
+Runs on generated, fixed datasets (N tags and N synonym keys per size), with
+no database: ``resolve_to_tag_ids`` is measured on its cached path, where
+every input canonicalizes to a tag already in :mod:`tag_cache`. ::
+
+    python benchmarks/micro.py --update-baseline         # record a baseline
+    python benchmarks/micro.py --threshold 0.10          # compare, exit 1 on regressions
+
+Results are written to ``--output`` on every run; timings are the best of
+``--repeat`` samples of at least ``--min-time`` seconds each, in nanoseconds
+per operation. Cases with per-input callables also report p50/p99 latency over
+their inputs, each input timed as the best of ``--repeat`` calls.
+``suggest_build`` is too slow to loop: it is timed once and also reports how
+far the process's peak RSS grew while it built a second snapshot next to the
+one being served, as the background builder does.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from sqlalchemy.orm import Session
+
+from app.services import synonyms as syn
+from app.services import tag_cache, tag_events, tagging
+from app.services.suggest_index import SuggestSnapshot
+from app.services.tag_extract import ExtractAutomaton, _patterns
+
+SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+CATEGORIES = ("topic", "condition", "allergy", "age", "preference")
+_SYLLABLES = (
+    "ba", "be", "bo", "da", "di", "el", "fa", "ga", "ka", "ki", "la", "li", "lo", "ma", "mi",
+    "na", "ne", "no", "pa", "pe", "ra", "ri", "sa", "se", "ta", "te", "to", "va", "za", "zu",
+)
+BATCH = 1000
+NOTE_CHARS = 10_000
+
+
+@dataclass(frozen=True)
+class Dataset:
+    rows: list[SimpleNamespace]
+    synonyms: dict[str, str]
+    texts: list[str]
+    queries: list[str]
+    tag_inputs: list[list[str]]
+    note: str
+
+
+@dataclass(frozen=True)
+class Case:
+    ops: int
+    run: Callable[[], object]
+    each: Callable[[str], object] | None = None  # one operation, for percentiles
+    inputs: Sequence[str] = ()
+    once: bool = False  # timed in a single run, with peak RSS growth
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _phrase(rng: random.Random, seen: set[str]) -> str:
+    while True:
+        phrase = " ".join(_word(rng) for _ in range(rng.randint(1, 3)))
+        if phrase not in seen:
+            seen.add(phrase)
+            return phrase
+
+
+def make_dataset(n: int, seed: int = 1234) -> Dataset:
+    """``n`` tags and ``n`` synonym keys; identical for the same ``(n, seed)``."""
+    rng = random.Random(seed)
+    seen: set[str] = set()
+    rows = []
+    for i in range(n):
+        label = _phrase(rng, seen).title()
+        rows.append(
+            SimpleNamespace(
+                id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                slug=f"{rng.choice(CATEGORIES)}_{i}",
+                label=label,
+                category=rng.choice(CATEGORIES),
+            )
+        )
+    synonyms = {_phrase(rng, seen): rng.choice(rows).slug for _ in range(n)}
+    keys = list(synonyms)
+
+    def messy(key: str) -> str:
+        return f"  {key.upper() if rng.random() < 0.3 else key}  ".replace(" ", "  ", rng.randint(0, 1))
+
+    # Half synonym hits with messy spacing/casing, half misses
+    texts = [messy(rng.choice(keys)) if i % 2 else _phrase(rng, set()) for i in range(BATCH)]
+    queries = []
+    for _ in range(200):
+        term = rng.choice(keys) if rng.random() < 0.5 else rng.choice(rows).label.lower()
+        queries.append(term[: rng.randint(2, min(len(term), 8))])
+    tag_inputs = [[messy(k) for k in rng.sample(keys, 10)] for _ in range(BATCH // 10)]
+    # A free-text note for extract: sentences of generated words with about
+    # one synonym key or tag label in ten phrases
+    parts = []
+    while sum(map(len, parts)) < NOTE_CHARS:
+        if rng.random() < 0.1:
+            phrase = rng.choice(keys) if rng.random() < 0.5 else rng.choice(rows).label
+        else:
+            phrase = _word(rng)
+        parts.append(phrase + rng.choice((" ", " ", " ", ", ", ". ", "\n")))
+    note = "".join(parts)[:NOTE_CHARS]
+    return Dataset(rows, synonyms, texts, queries, tag_inputs, note)
+
+
+def _install(data: Dataset) -> Callable[[], None]:
+    """Serve ``data`` from the synonym map and the tag cache; returns an undo callback."""
+    previous = syn._state
+    syn._state = syn.SynonymState(previous.version + 1_000_000, data.synonyms, "bench", 0)
+    tag_cache.cache.clear()
+    tag_cache.cache.put(data.rows, tag_events.version())
+
+    def undo() -> None:
+        syn._state = previous
+        tag_cache.cache.clear()
+
+    return undo
+
+
+def benchmarks(data: Dataset) -> dict[str, Case]:
+    """name -> case; ``Case.run`` performs ``Case.ops`` operations."""
+    snapshot = SuggestSnapshot.build(data.rows, data.synonyms)
+    automaton = ExtractAutomaton.build(*_patterns(data.rows, data.synonyms))
+    session = Session()  # never executes: every input is served from the cache
+    normalize, canonicalize, slugify = syn.normalize, syn.canonicalize, syn.slugify
+    texts, queries, tag_inputs, note = data.texts, data.queries, data.tag_inputs, data.note
+    return {
+        "normalize": Case(len(texts), lambda: [normalize(t) for t in texts]),
+        "canonicalize": Case(len(texts), lambda: [canonicalize(t) for t in texts]),
+        "slugify": Case(len(texts), lambda: [slugify(t) for t in texts]),
+        "suggest_search": Case(
+            len(queries),
+            lambda: [snapshot.search(q, 8) for q in queries],
+            lambda q: snapshot.search(q, 8),
+            queries,
+        ),
+        "extract_10kb": Case(1, lambda: automaton.find(note)),
+        "suggest_build": Case(1, lambda: SuggestSnapshot.build(data.rows, data.synonyms), once=True),
+        "resolve_to_tag_ids": Case(
+            len(tag_inputs),
+            lambda: [tagging.resolve_to_tag_ids(session, inputs) for inputs in tag_inputs],
+        ),
+    }
+
+
+def measure(fn: Callable[[], object], ops: int, repeat: int, min_time: float = 0.05) -> float:
+    """Best of ``repeat`` samples, each looping ``fn`` for at least ``min_time`` seconds."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        if time.perf_counter() - start >= min_time:
+            break
+        loops *= 2
+    best = float("inf")
+    for _ in range(repeat):
+        start_ns = time.perf_counter_ns()
+        for _ in range(loops):
+            fn()
+        best = min(best, time.perf_counter_ns() - start_ns)
+    return best / (ops * loops)
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20 if sys.platform == "darwin" else 1 << 10)
+
+
+def measure_once(fn: Callable[[], object]) -> dict[str, float]:
+    """One timed call of ``fn`` and the growth of peak RSS during it."""
+    rss_before = _peak_rss_mb()
+    start_ns = time.perf_counter_ns()
+    fn()
+    elapsed = time.perf_counter_ns() - start_ns
+    return {"ns_per_op": float(elapsed), "peak_rss_growth_mb": round(_peak_rss_mb() - rss_before, 1)}
+
+
+def percentiles(fn: Callable[[str], object], inputs: Sequence[str], repeat: int) -> dict[str, float]:
+    """p50/p99 over ``inputs`` of the best of ``repeat`` timed calls each, in nanoseconds."""
+    timings = []
+    for item in inputs:
+        best = float("inf")
+        for _ in range(repeat):
+            start_ns = time.perf_counter_ns()
+            fn(item)
+            best = min(best, time.perf_counter_ns() - start_ns)
+        timings.append(best)
+    timings.sort()
+    return {f"p{p}_ns": float(timings[min(len(timings) - 1, len(timings) * p // 100)]) for p in (50, 99)}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Lines for every benchmark more than ``threshold`` (a fraction) slower than the baseline."""
+    regressions = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        ratio = current["ns_per_op"] / before["ns_per_op"]
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {before['ns_per_op']:.0f} -> {current['ns_per_op']:.0f} ns/op (+{(ratio - 1) * 100:.0f}%)"
+            )
+    return regressions
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _size(value: str) -> tuple[str, int]:
+    return (value, SIZES[value]) if value in SIZES else (value, int(value))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for tagging and synonym hot paths.")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="comma-separated: 1k, 10k, 100k or a number")
+    parser.add_argument("--only", action="append", help="benchmark name; repeatable")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per sample")
+    parser.add_argument("-o", "--output", type=Path, default=Path("bench-micro.json"))
+    parser.add_argument("--baseline", type=Path, default=Path("bench-micro-baseline.json"))
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, e.g. 0.15 = 15%%")
+    parser.add_argument("--update-baseline", action="store_true", help="also write results to --baseline")
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    for label, n in (_size(s) for s in args.sizes.split(",")):
+        start = time.perf_counter()
+        data = make_dataset(n)
+        undo = _install(data)
+        try:
+            for name, case in benchmarks(data).items():
+                if args.only and name not in args.only:
+                    continue
+                if case.once:
+                    result = results[f"{name}/{label}"] = {**measure_once(case.run), "ops": case.ops}
+                    print(
+                        f"{name}/{label}: {result['ns_per_op'] / 1e9:.2f} s, "
+                        f"peak RSS +{result['peak_rss_growth_mb']:.0f} MB",
+                        file=sys.stderr,
+                    )
+                    continue
+                ns = measure(case.run, case.ops, args.repeat, args.min_time)
+                result = results[f"{name}/{label}"] = {"ns_per_op": round(ns, 1), "ops": case.ops}
+                line = f"{name}/{label}: {ns / 1000:.2f} µs/op"
+                if case.each is not None:
+                    result.update(percentiles(case.each, case.inputs, args.repeat))
+                    line += f" (p50 {result['p50_ns'] / 1000:.2f} µs, p99 {result['p99_ns'] / 1000:.2f} µs)"
+                print(line, file=sys.stderr)
+        finally:
+            undo()
+        print(f"size {label} done in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    doc = {
+        "meta": {
+            "commit": _commit(),
+            "started_at": datetime.now(UTC).isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    text = json.dumps(doc, indent=2) + "\n"
+    args.output.write_text(text, encoding="utf-8")
+
+    regressions: list[str] = []
+    if args.update_baseline:
+        args.baseline.write_text(text, encoding="utf-8")
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline["results"], args.threshold)
+        print(
+            f"Compared with {args.baseline} (commit {baseline['meta'].get('commit')}): "
+            f"{len(regressions)} regression(s) above {args.threshold:.0%}",
+            file=sys.stderr,
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from app.services import taxonomy_artifact
+from app.services.synonyms import SYNONYMS_PATH, parse
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compile the synonyms into the memory-mapped taxonomy artifact."
+    )
+    parser.add_argument("--synonyms", type=Path, default=SYNONYMS_PATH)
+    parser.add_argument("-o", "--output", type=Path, default=taxonomy_artifact.ARTIFACT_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    synonyms_raw = args.synonyms.read_bytes()
+    synonyms = parse(synonyms_raw, args.synonyms)
+    data = taxonomy_artifact.build(synonyms, taxonomy_artifact.digest(synonyms_raw))
+    # Write next to the target and rename, so running workers never map a
+    # half-written file
+    tmp = args.output.with_name(args.output.name + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(args.output)
+    print(
+        f"Wrote {args.output} ({len(data)} bytes, {len(synonyms)} synonyms) "
+        f"in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import json
+import random
+import sys
+import uuid
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TextIO
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TAXONOMY_PATH = REPO_ROOT / "taxonomy" / "tags_taxonomy.json"
+SYNONYMS_PATH = REPO_ROOT / "taxonomy" / "synonyms.json"
+
+REGIONS = ("US", "CA", "GB", "IE", "AU", "NZ", "DE", "FR", "ES", "MX", "IN", "SG")
+LANGUAGES = ("en", "en", "en", "es", "fr", "de", "hi", "zh")
+GENDERS = ("f", "m", "other", "undisclosed", None)
+GENDER_WEIGHTS = (45, 45, 3, 4, 3)
+CHILDREN_PER_USER = (1, 2, 3, 4, 5)
+CHILDREN_WEIGHTS = (52, 31, 11, 4, 2)
+NOISE_WORDS = (
+    "teething", "drool", "colic", "swaddle", "pacifier", "stroller", "daycare", "nanny",
+    "grandma", "bottle", "formula", "pumping", "latch", "burping", "hiccups", "diaper",
+    "rash", "cradle", "cap", "tummy", "time", "crawling", "walking", "babbling", "biting",
+    "tantrums", "potty", "bath", "travel", "car", "seat", "night", "terrors", "twins",
+)
+
+
+def _zipf_cumulative(n: int, s: float) -> list[float]:
+    return list(itertools.accumulate(1.0 / rank**s for rank in range(1, n + 1)))
+
+
+class TagSampler:
+    """Free-text tags as users type them.
+
+    Canonical labels and synonym keys are drawn with Zipfian popularity. A
+    ``custom_rate`` share of picks is noise: typos of popular terms and
+    phrases from a long tail that resolve to custom tags.
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        zipf_s: float = 1.1,
+        custom_rate: float = 0.05,
+        custom_pool: int = 5000,
+    ) -> None:
+        taxonomy = json.loads(TAXONOMY_PATH.read_text(encoding="utf-8"))
+        synonyms = json.loads(SYNONYMS_PATH.read_text(encoding="utf-8"))
+        terms = sorted({t["label"] for t in taxonomy} | set(synonyms))
+        rng.shuffle(terms)
+        self.rng = rng
+        self.terms = terms
+        self.custom_rate = custom_rate
+        self.custom = [
+            " ".join(rng.sample(NOISE_WORDS, rng.randint(1, 3))) for _ in range(custom_pool)
+        ]
+        self._term_cum = _zipf_cumulative(len(terms), zipf_s)
+        self._custom_cum = _zipf_cumulative(custom_pool, zipf_s)
+
+    def _pick(self, items: list[str], cum: list[float]) -> str:
+        return items[bisect.bisect(cum, self.rng.random() * cum[-1])]
+
+    def _typo(self, term: str) -> str:
+        if len(term) < 4:
+            return term + term[-1]
+        i = self.rng.randrange(1, len(term) - 1)
+        if self.rng.random() < 0.5:
+            return term[:i] + term[i + 1 :]
+        return term[:i] + term[i + 1] + term[i] + term[i + 2 :]
+
+    def term(self) -> str:
+        if self.rng.random() >= self.custom_rate:
+            return self._pick(self.terms, self._term_cum)
+        if self.rng.random() < 0.5:
+            return self._typo(self._pick(self.terms, self._term_cum))
+        return self._pick(self.custom, self._custom_cum)
+
+    def sample(self, k: int) -> list[str]:
+        picked: dict[str, None] = {}
+        for _ in range(k * 3):
+            if len(picked) >= k:
+                break
+            picked.setdefault(self.term())
+        return list(picked)
+
+
+def generate(
+    out: TextIO,
+    users: int,
+    tags_per_child: float,
+    sampler: TagSampler,
+    rng: random.Random,
+    today: date | None = None,
+) -> int:
+    """Write one import_children.py NDJSON record per child; returns the count."""
+    today = today or date.today()
+    written = 0
+    for _ in range(users):
+        user_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        region = rng.choice(REGIONS)
+        language = rng.choice(LANGUAGES)
+        for _ in range(rng.choices(CHILDREN_PER_USER, CHILDREN_WEIGHTS)[0]):
+            k = min(int(rng.expovariate(1 / tags_per_child)) if tags_per_child > 0 else 0, 30)
+            record = {
+                "user_id": user_id,
+                "name": f"Child {written + 1}",
+                "dob": (today - timedelta(days=rng.randint(0, 6 * 365))).isoformat(),
+                "gender": rng.choices(GENDERS, GENDER_WEIGHTS)[0],
+                "region": region,
+                "language_pref": language,
+                "tags": sampler.sample(k),
+            }
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate synthetic users, children and free-text tags as NDJSON "
+        "for scripts/import_children.py."
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--tags-per-child", type=float, default=4.0, help="mean")
+    parser.add_argument("--zipf", type=float, default=1.1, help="tag popularity exponent")
+    parser.add_argument("--custom-rate", type=float, default=0.05, help="share of noisy/custom tags")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("-o", "--output", type=Path, help="default: stdout")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sampler = TagSampler(rng, args.zipf, args.custom_rate)
+    out = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        # Fixed date keeps the output byte-identical for a given seed
+        count = generate(out, args.users, args.tags_per_child, sampler, rng, date(2026, 1, 1))
+    finally:
+        if args.output:
+            out.close()
+    print(f"Generated {count} children for {args.users} users", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
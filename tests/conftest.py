@@ -1,11 +1,10 @@
 import os
 import uuid
+
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 
-# Adjust to your actual metadata import
-from app.core.db import Base  # if you expose metadata via Base = declarative_base()
 from app.models.child import ChildProfile
 from app.models.tag import Tag
 
@@ -22,8 +21,8 @@ def db(engine):
     # function-scoped transaction so each test is isolated
     conn = engine.connect()
     tx = conn.begin()
-    Session = sessionmaker(bind=conn, autoflush=False, autocommit=False, future=True)
-    session = Session()
+    session_factory = sessionmaker(bind=conn, autoflush=False, autocommit=False, future=True)
+    session = session_factory()
     try:
         yield session
     finally:
@@ -59,3 +58,19 @@ def ensure_seeded(db):
     missing = required_slugs - slugs
     if missing:
         pytest.skip(f"Seed missing canonical tags: {missing}")
+
+
+@pytest.fixture
+def sql_statements(db):
+    """Record every SQL statement the test session sends to the database."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _record)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", _record)
@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+
+from app.services import tag_events
+from app.services.background import BackgroundBuilder
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_readers_get_the_previous_value_while_the_builder_runs():
+    release = threading.Event()
+    builds = []
+
+    def build():
+        builds.append(None)
+        if len(builds) > 1:
+            release.wait(5)
+        return len(builds)
+
+    builder = BackgroundBuilder("test-builder", build, debounce=0.05)
+    stop = builder.start()
+    try:
+        assert builder.ensure() == 1
+        for _ in range(5):
+            tag_events.tags_changed()
+            builder.invalidate()
+        # A burst of changes is one rebuild, and readers never wait for it
+        assert builder.get() == 1
+        assert _wait_for(lambda: len(builds) == 2)
+        assert builder.get() == 1
+        release.set()
+        assert _wait_for(lambda: builder.get() == 2)
+        assert builder.current()[1] == tag_events.version()
+        time.sleep(0.1)
+        assert len(builds) == 2
+    finally:
+        release.set()
+        stop()
+
+
+def test_failed_rebuild_keeps_serving_the_previous_value():
+    results = iter([1])
+
+    def build():
+        return next(results)
+
+    builder = BackgroundBuilder("test-builder", build)
+    assert builder.ensure() == 1
+    with pytest.raises(StopIteration):
+        builder.refresh()
+    assert builder.ensure() == 1
@@ -0,0 +1,90 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+
+from app.core.db import SessionLocal
+from app.main import app
+from app.models.child import ChildProfile
+from app.models.tag import ChildTag
+from app.schemas.tags import MAX_BULK_WRITE_CHILDREN
+from app.services import tagging
+
+CHILDREN = 500
+
+
+def _make_children(user_id, n):
+    with SessionLocal() as s:
+        children = [ChildProfile(user_id=user_id, name=f"c{i}") for i in range(n)]
+        s.add_all(children)
+        s.commit()
+        return [str(c.id) for c in children]
+
+
+def _delete_children(*user_ids):
+    # Their child_tag rows go with them (ON DELETE CASCADE)
+    with SessionLocal() as s:
+        s.execute(delete(ChildProfile).where(ChildProfile.user_id.in_(user_ids)))
+        s.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_bulk_put_reports_per_child_results():
+    user_id, other_id = str(uuid.uuid4()), str(uuid.uuid4())
+    try:
+        mine = _make_children(user_id, 2)
+        theirs = _make_children(other_id, 1)
+        headers = {"X-User-Id": user_id}
+        body = {
+            "children": {
+                mine[0]: ["sleep", "Eczema", "eczema"],
+                theirs[0]: ["sleep"],
+                "not-a-uuid": ["sleep"],
+                mine[1]: [],
+            }
+        }
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            r = await ac.put("/api/v1/children/tags", headers=headers, json=body)
+            assert r.status_code == 200
+            results = r.json()["results"]
+            assert [x.get("error") for x in results] == [None, "forbidden", "not_found", None]
+            assert [t["slug"] for t in results[0]["tags"]] == ["topic_sleep", "cond_eczema"]
+            assert results[3]["tags"] == []
+
+            r = await ac.get(f"/api/v1/children/{mine[0]}/tags", headers=headers)
+            assert sorted(t["slug"] for t in r.json()["tags"]) == ["cond_eczema", "topic_sleep"]
+
+            r = await ac.put("/api/v1/children/tags", headers=headers, json={"children": {}})
+            assert r.status_code == 422
+            too_many = {str(uuid.uuid4()): [] for _ in range(MAX_BULK_WRITE_CHILDREN + 1)}
+            r = await ac.put("/api/v1/children/tags", headers=headers, json={"children": too_many})
+            assert r.status_code == 422
+    finally:
+        _delete_children(user_id, other_id)
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_bulk_write_of_many_children(db):
+    user_id = str(uuid.uuid4())
+    kids = [ChildProfile(user_id=user_id, name=f"c{i}") for i in range(CHILDREN)]
+    db.add_all(kids)
+    db.flush()
+    tag_sets = [
+        ["sleep", "eczema", "bulk shared"],
+        ["peanut", "naps"],
+        ["egg", "bulk shared", "bulk {}"],
+    ]
+    assignments = {
+        kid.id: [t.format(i) for t in tag_sets[i % len(tag_sets)]] for i, kid in enumerate(kids)
+    }
+
+    out = tagging.children_set_tags(db, assignments)
+    assert [t["slug"] for t in out[kids[0].id]] == ["topic_sleep", "cond_eczema", "custom_bulkshared"]
+    assert out[kids[5].id][-1]["slug"] == "custom_bulk5"
+    pairs = db.execute(
+        select(func.count()).where(ChildTag.child_id.in_([kid.id for kid in kids]))
+    ).scalar_one()
+    assert pairs == sum(len(v) for v in assignments.values())
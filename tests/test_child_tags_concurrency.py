@@ -0,0 +1,65 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import delete, func, select
+
+from app.core.db import SessionLocal
+from app.main import app
+from app.models.child import ChildProfile
+from app.models.tag import Tag
+
+CHILDREN = 40
+ROUNDS = 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_concurrent_puts_share_custom_tags():
+    user_id = str(uuid.uuid4())
+    run = uuid.uuid4().hex[:8]
+    custom_slugs = (f"custom_shared{run}", f"custom_own{run}")
+    try:
+        with SessionLocal() as s:
+            children = [ChildProfile(user_id=user_id, name=f"c{i}") for i in range(CHILDREN)]
+            s.add_all(children)
+            s.commit()
+            child_ids = [str(c.id) for c in children]
+
+        # Every request names the same brand-new custom tag, so the first
+        # inserts race on uq_tag_slug.
+        tag_sets = [
+            ["sleep", "eczema", f"shared {run}"],
+            ["peanut", f"shared {run}"],
+            ["sleep", "eczema", f"shared {run}"],
+            ["naps", "egg", f"shared {run}", f"own {run}"],
+            ["naps", "egg", f"shared {run}", f"own {run}"],
+        ]
+        headers = {"X-User-Id": user_id}
+
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            start = time.perf_counter()
+            responses = []
+            for tags in tag_sets[:ROUNDS]:
+                responses += await asyncio.gather(
+                    *(
+                        ac.put(f"/api/v1/children/{cid}/tags", headers=headers, json={"tags": tags})
+                        for cid in child_ids
+                    )
+                )
+            elapsed = time.perf_counter() - start
+
+        assert [r.status_code for r in responses] == [200] * len(responses)
+        print(f"\n{len(responses)} concurrent PUTs in {elapsed:.2f}s: {len(responses) / elapsed:.0f} req/s")
+
+        with SessionLocal() as s:
+            for slug in custom_slugs:
+                assert s.execute(select(func.count()).where(Tag.slug == slug)).scalar_one() == 1
+    finally:
+        # Child tags go with the children and tags (ON DELETE CASCADE)
+        with SessionLocal() as s:
+            s.execute(delete(ChildProfile).where(ChildProfile.user_id == user_id))
+            s.execute(delete(Tag).where(Tag.slug.in_(custom_slugs)))
+            s.commit()
@@ -0,0 +1,77 @@
+import json
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, select
+
+from app.core.config import settings
+from app.core.db import SessionLocal
+from app.main import app
+from app.models.child import ChildProfile
+from app.services import tagging
+from app.services.export import iter_ndjson
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_export_streams_children_with_slugs_in_batches(db):
+    kids = [ChildProfile(user_id="u_export", name=f"e{i}", gender="f") for i in range(5)]
+    db.add_all(kids)
+    db.flush()
+    tagging.child_set_tags(db, kids[0].id, ["sleep", "eczema"])
+    db.refresh(kids[0])
+
+    chunks = list(iter_ndjson(db, since=kids[0].updated_at, batch_size=2))
+    assert len(chunks) >= 3
+    records = {r["id"]: r for r in (json.loads(line) for c in chunks for line in c.splitlines())}
+    assert records[str(kids[0].id)]["tags"] == ["cond_eczema", "topic_sleep"]
+    assert records[str(kids[0].id)]["gender"] == "female"
+    assert records[str(kids[1].id)]["tags"] == []
+
+
+def _delete_child(child_id):
+    # Its child_tag rows go with it (ON DELETE CASCADE)
+    with SessionLocal() as s:
+        s.execute(delete(ChildProfile).where(ChildProfile.id == child_id))
+        s.commit()
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_tag_changes_bump_updated_at():
+    # Separate commits: updated_at is the transaction time, so the rolled-back
+    # db fixture would see it unchanged
+    with SessionLocal() as s:
+        kid = ChildProfile(user_id="u_export", name="bump")
+        s.add(kid)
+        s.commit()
+        kid_id, before = kid.id, kid.updated_at
+        try:
+            tagging.child_set_tags(s, kid_id, ["naps"])
+            s.commit()
+            after = s.execute(select(ChildProfile.updated_at).where(ChildProfile.id == kid_id)).scalar_one()
+        finally:
+            _delete_child(kid_id)
+    assert after > before
+
+
+def test_admin_export_endpoint(monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    with SessionLocal() as s:
+        kid = ChildProfile(user_id="u_export", name=f"admin {uuid.uuid4().hex[:6]}")
+        s.add(kid)
+        s.commit()
+        since = kid.updated_at.isoformat()
+        kid_id = str(kid.id)
+
+    # The endpoint reads through its own session, so the child is committed
+    try:
+        client = TestClient(app)
+        url = "/api/v1/admin/export/children.ndjson"
+        assert client.get(url).status_code == 403
+        resp = client.get(url, params={"since": since}, headers={"X-Admin-Token": "s3cret"})
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        ids = [json.loads(line)["id"] for line in resp.text.splitlines()]
+        assert kid_id in ids
+    finally:
+        _delete_child(uuid.UUID(kid_id))
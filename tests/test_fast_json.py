@@ -0,0 +1,67 @@
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import responses
+from app.core.config import settings
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def _both(client, monkeypatch, method, url, **kwargs):
+    out = []
+    for fast in (False, True):
+        monkeypatch.setattr(settings, "fast_json", fast)
+        resp = client.request(method, url, **kwargs)
+        assert resp.status_code == 200, resp.text
+        out.append(resp)
+    return out
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_fast_path_returns_identical_bytes(client, monkeypatch):
+    user = str(uuid.uuid4())
+    headers = {"X-User-Id": user}
+    cid = client.post("/api/v1/children", headers=headers, json={"name": "Fast"}).json()["id"]
+    other = client.post("/api/v1/children", headers=headers, json={"name": "Fast 2"}).json()["id"]
+    tags = {"tags": ["sleep", "Eczema", "crème brûlée allergy"]}
+
+    slow, fast = _both(client, monkeypatch, "PUT", f"/api/v1/children/{cid}/tags", headers=headers, json=tags)
+    assert slow.content == fast.content
+    assert fast.headers["content-type"] == "application/json"
+    assert "crème brûlée allergy".encode() in fast.content
+
+    requests = [
+        ("GET", f"/api/v1/children/{cid}/tags", {"headers": headers}),
+        ("GET", "/api/v1/children/tags", {"headers": headers, "params": {"ids": f"{other},{cid}"}}),
+        ("GET", "/api/v1/tags/suggest", {"params": {"q": "ecz"}}),
+        ("POST", "/api/v1/tags/suggest:batch", {"json": {"queries": [{"q": "sle"}, {"q": "x"}]}}),
+        ("POST", "/api/v1/tags/extract", {"json": {"text": "Eczema and sleep regression, naps too."}}),
+        ("PUT", "/api/v1/children/tags", {"headers": headers, "json": {"children": {cid: tags["tags"]}}}),
+    ]
+    for method, url, kwargs in requests:
+        slow, fast = _both(client, monkeypatch, method, url, **kwargs)
+        assert slow.content == fast.content, url
+
+
+def test_taxonomy_fragments_are_reused_and_custom_tags_are_not_kept(monkeypatch):
+    monkeypatch.setattr(responses, "_fragments", {})
+    tag = {"slug": "topic_sleep", "label": "Sleep", "category": None}
+    first = responses.tag_fragment(tag)
+    assert responses.tag_fragment(dict(tag)) is first
+    responses.tag_fragment({"slug": "custom_x", "label": "X", "category": None})
+    assert list(responses._fragments) == [("topic_sleep", "Sleep", None)]
+    # A relabelled tag gets a new fragment rather than the stale one
+    assert b'"Sleeping"' in responses.tag_fragment({**tag, "label": "Sleeping"})
+
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    content = {"query": "crème", "results": [{"slug": "a", "label": "Ä \"b\"", "category": None}], "n": [1, True]}
+    fast = responses.dumps(content)
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.dumps(content) == fast
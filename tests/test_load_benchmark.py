@@ -0,0 +1,91 @@
+import io
+import json
+import random
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from scripts.generate_children import TagSampler, generate
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _records(seed=7, users=200, **kwargs):
+    rng = random.Random(seed)
+    out = io.StringIO()
+    generate(out, users, 4.0, TagSampler(rng, **kwargs), rng, date(2026, 1, 1))
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_generator_is_deterministic_and_importable_shape():
+    records = _records()
+    assert records == _records()
+    assert len({r["user_id"] for r in records}) == 200 < len(records)
+    for r in records:
+        assert set(r) == {"user_id", "name", "dob", "gender", "region", "language_pref", "tags"}
+        assert len(r["tags"]) == len(set(r["tags"]))
+
+
+def test_tag_popularity_is_skewed_with_custom_noise():
+    rng = random.Random(1)
+    sampler = TagSampler(rng, zipf_s=1.1, custom_rate=0.1)
+    picks = [sampler.term() for _ in range(20000)]
+    counts = sorted((picks.count(t) for t in set(picks)), reverse=True)
+    # The head dominates: the top term alone beats the bottom half combined
+    assert counts[0] > sum(counts[len(counts) // 2 :])
+    known = set(sampler.terms)
+    noise = sum(1 for p in picks if p not in known)
+    assert 0.05 * len(picks) < noise < 0.15 * len(picks)
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_load_harness_reports_json(tmp_path):
+    out = tmp_path / "load.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(REPO_ROOT / "benchmarks" / "load.py"),
+            "--requests", "20", "--children", "5", "--concurrency", "4", "--custom-rate", "0",
+            "-o", str(out),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert set(result["scenarios"]) == {
+        "create_child",
+        "suggest",
+        "put_tags",
+        "get_tags",
+        "put_children_tags",
+    }
+    for stats in result["scenarios"].values():
+        assert stats["errors"] == 0
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+    bulk = result["scenarios"]["put_children_tags"]
+    assert bulk["children_per_s"] >= bulk["throughput_rps"]
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_concurrency_benchmark_reports_both_stacks(tmp_path):
+    out = tmp_path / "concurrency.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(REPO_ROOT / "benchmarks" / "concurrency.py"),
+            "--workers", "4", "--duration", "0.3", "--children", "5",
+            "--scenario", "get_tags", "--scenario", "set_tags",
+            "-o", str(out),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    result = json.loads(out.read_text(encoding="utf-8"))
+    assert set(result["scenarios"]) == {"get_tags", "set_tags"}
+    for stacks in result["scenarios"].values():
+        assert set(stacks) == {"sync", "async"}
+        for stats in stacks.values():
+            assert stats["errors"] == 0 and stats["requests"] > 0
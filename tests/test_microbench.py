@@ -0,0 +1,54 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.micro import compare, make_dataset
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_datasets_are_fixed():
+    a, b = make_dataset(500), make_dataset(500)
+    assert a == b
+    assert len(a.rows) == len(a.synonyms) == 500
+    assert len({row.slug for row in a.rows}) == 500
+    assert len(a.note) == 10_000
+
+
+def test_compare_flags_only_slowdowns_above_threshold():
+    baseline = {"a/1k": {"ns_per_op": 100.0}, "b/1k": {"ns_per_op": 100.0}, "c/1k": {"ns_per_op": 100.0}}
+    results = {"a/1k": {"ns_per_op": 114.0}, "b/1k": {"ns_per_op": 130.0}, "c/1k": {"ns_per_op": 50.0}}
+    results["new/1k"] = {"ns_per_op": 1e9}
+    assert compare(results, baseline, 0.15) == ["b/1k: 100 -> 130 ns/op (+30%)"]
+
+
+def test_runs_and_writes_baseline(tmp_path):
+    out, baseline = tmp_path / "micro.json", tmp_path / "baseline.json"
+    cmd = [
+        sys.executable,
+        str(REPO_ROOT / "benchmarks" / "micro.py"),
+        "--sizes", "200", "--repeat", "1", "--min-time", "0.001",
+        "-o", str(out), "--baseline", str(baseline),
+    ]
+    subprocess.run([*cmd, "--update-baseline"], check=True, capture_output=True)
+    assert out.read_text(encoding="utf-8") == baseline.read_text(encoding="utf-8")
+    results = json.loads(out.read_text(encoding="utf-8"))["results"]
+    assert set(results) == {
+        f"{name}/200"
+        for name in (
+            "normalize",
+            "canonicalize",
+            "slugify",
+            "suggest_search",
+            "extract_10kb",
+            "suggest_build",
+            "resolve_to_tag_ids",
+        )
+    }
+    assert results["suggest_build/200"]["peak_rss_growth_mb"] >= 0
+    assert results["suggest_search/200"]["p50_ns"] <= results["suggest_search/200"]["p99_ns"]
+    # Nothing can be 1000x slower than itself; the comparison path runs clean
+    run = subprocess.run([*cmd, "--threshold", "1000"], capture_output=True, text=True, check=False)
+    assert run.returncode == 0, run.stderr
+    assert "0 regression(s)" in run.stderr
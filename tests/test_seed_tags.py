@@ -1,7 +1,8 @@
 import json
 import os
-from pathlib import Path
 import subprocess
+from pathlib import Path
+
 import pytest
 from sqlalchemy import create_engine, text
 
@@ -29,3 +30,73 @@ def test_seed_idempotent():
             """)
         ).all()
         assert dupes == []
+
+
+def _seed(*args):
+    return subprocess.run(
+        ["python", str(SEED_SCRIPT), *map(str, args)], check=True, capture_output=True, text=True
+    ).stdout
+
+
+def _tag_state(conn, slugs):
+    rows = conn.execute(
+        text("SELECT slug, label, active FROM tag WHERE slug = ANY(:slugs)"), {"slugs": list(slugs)}
+    ).all()
+    return {slug: (label, active) for slug, label, active in rows}
+
+
+def test_seed_writes_only_the_diff(tmp_path):
+    _seed()
+    assert "0 to insert, 0 to update, 0 to deactivate" in _seed("--dry-run")
+
+    taxonomy = json.loads(TAXONOMY_PATH.read_text(encoding="utf-8"))
+    edited = [t for t in taxonomy if t["slug"] != "cond_rsv"]
+    edited[0] = {**edited[0], "label": "Newborn"}
+    edited.append({"slug": "topic_seed_test", "label": "Seed test", "category": "topic"})
+    path = tmp_path / "taxonomy.json"
+    path.write_text(json.dumps(edited), encoding="utf-8")
+    slugs = (edited[0]["slug"], "cond_rsv", "topic_seed_test")
+
+    engine = create_engine(DATABASE_URL, future=True)
+    try:
+        report = _seed("--taxonomy", path, "--dry-run")
+        assert f"~ {slugs[0]}: {taxonomy[0]['label']!r} -> 'Newborn'" in report
+        assert "- cond_rsv" in report and "+ topic_seed_test: 'Seed test'" in report
+        with engine.connect() as conn:
+            assert _tag_state(conn, slugs)[slugs[0]][0] == taxonomy[0]["label"]
+
+        out = _seed("--taxonomy", path, "--chunk-size", 1)
+        assert "Inserted 1, updated 1, deactivated 1" in out
+        with engine.connect() as conn:
+            assert _tag_state(conn, slugs) == {
+                slugs[0]: ("Newborn", True),
+                "cond_rsv": ("RSV", False),
+                "topic_seed_test": ("Seed test", True),
+            }
+            edited_version = conn.execute(text("SELECT version FROM taxonomy_version")).scalar_one()
+        assert f"Taxonomy version: {edited_version}" in out
+    finally:
+        out = _seed()
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM tag WHERE slug = 'topic_seed_test'"))
+    assert "updated 2, deactivated 1" in out
+    with engine.connect() as conn:
+        state = _tag_state(conn, slugs)
+        assert state[slugs[0]] == (taxonomy[0]["label"], True) and state["cond_rsv"] == ("RSV", True)
+        version = conn.execute(text("SELECT version FROM taxonomy_version")).scalar_one()
+    assert version != edited_version
+
+
+def test_admin_taxonomy_version(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.main import app
+
+    out = _seed()
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    resp = TestClient(app).get("/api/v1/admin/taxonomy", headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert f"Taxonomy version: {body['version']}" in out
+    assert body["tags"] == len(json.loads(TAXONOMY_PATH.read_text(encoding="utf-8")))
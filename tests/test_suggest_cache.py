@@ -0,0 +1,63 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import suggest_cache, tag_events
+from app.services.suggest_cache import SuggestCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    cache = SuggestCache(maxsize=2, ttl=60, clock=FakeClock())
+    cache.put(("ec", 8), [{"slug": "cond_eczema"}])
+    cache.put(("sl", 8), [{"slug": "topic_sleep"}])
+    assert cache.get(("ec", 8)) == [{"slug": "cond_eczema"}]
+    cache.put(("na", 8), [{"slug": "topic_naps"}])  # evicts ("sl", 8)
+    assert cache.get(("sl", 8)) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+    assert stats["size"] == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = SuggestCache(maxsize=10, ttl=5, clock=clock)
+    cache.put(("ec", 8), [])
+    clock.now = 4.9
+    assert cache.get(("ec", 8)) == []
+    clock.now = 5.0
+    assert cache.get(("ec", 8)) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_results_computed_before_a_change_are_not_cached():
+    cache = SuggestCache(maxsize=10, ttl=60, clock=FakeClock())
+    version = tag_events.version()
+    tag_events.tags_changed()
+    cache.put(("ec", 8), [], version)
+    assert cache.get(("ec", 8)) is None
+    cache.put(("ec", 8), [], tag_events.version())
+    assert cache.get(("ec", 8)) == []
+    assert cache.stats()["stale_puts"] == 1
+
+
+def test_tags_changed_clears_shared_cache():
+    suggest_cache.cache.put(("memory", "zz", 8), [])
+    tag_events.tags_changed()
+    assert suggest_cache.cache.get(("memory", "zz", 8)) is None
+
+
+def test_admin_stats_requires_token(monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    assert client.get("/api/v1/admin/cache/suggest").status_code == 403
+    resp = client.get("/api/v1/admin/cache/suggest", headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200
+    assert {"hits", "misses", "evictions"} <= resp.json().keys()
@@ -0,0 +1,129 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import suggest_index, tag_events
+from app.services import synonyms as syn
+from app.services.suggest_index import SuggestSnapshot
+
+ROWS = [
+    SimpleNamespace(slug="cond_eczema", label="Eczema", category=None),
+    SimpleNamespace(slug="topic_vaccines", label="Vaccines", category=None),
+    SimpleNamespace(slug="topic_sleep", label="Sleep", category=None),
+    SimpleNamespace(slug="custom_sleepsack", label="Sleep sack", category=None),
+    SimpleNamespace(slug="custom_nosleep", label="No sleep", category=None),
+]
+SYNONYMS = {
+    "atopic dermatitis": "cond_eczema",
+    "shots": "topic_vaccines",
+    "sleep training": "topic_sleep",
+    "unknown key": "topic_missing",
+}
+
+
+def _slugs(snap, q, limit=8):
+    return [item["slug"] for item in snap.search(q, limit)]
+
+
+def test_prefix_ranks_before_contains():
+    snap = SuggestSnapshot.build(ROWS, SYNONYMS)
+    assert _slugs(snap, "sle") == ["topic_sleep", "custom_sleepsack", "custom_nosleep"]
+
+
+def test_synonym_prefix_and_contains_hits():
+    snap = SuggestSnapshot.build(ROWS, SYNONYMS)
+    assert _slugs(snap, "sho") == ["topic_vaccines"]
+    assert _slugs(snap, "derma") == ["cond_eczema"]
+    # synonym keys pointing at tags that are not indexed are ignored
+    assert _slugs(snap, "unknown") == []
+
+
+def test_non_matching_queries_return_nothing():
+    snap = SuggestSnapshot.build(ROWS, SYNONYMS)
+    # more than two edits away from every indexed word
+    assert _slugs(snap, "sleepxyz") == []
+    assert _slugs(snap, "eczema") == ["cond_eczema"]
+
+
+def test_limit_is_respected():
+    snap = SuggestSnapshot.build(ROWS, SYNONYMS)
+    assert _slugs(snap, "sle", limit=2) == ["topic_sleep", "custom_sleepsack"]
+    assert len(snap) == len(ROWS)
+
+
+def test_synonym_hits():
+    snap = SuggestSnapshot.build((), SYNONYMS)
+    assert snap.synonym_hits("sho") == ({"topic_vaccines"}, {"topic_vaccines"})
+    assert snap.synonym_hits("train") == (set(), {"topic_sleep"})
+    assert snap.slug_synonyms["cond_eczema"] == ("atopic dermatitis",)
+
+
+FUZZY_ROWS = [
+    SimpleNamespace(slug="cond_eczema", label="Eczema", category=None),
+    SimpleNamespace(slug="allergy_peanut", label="Peanut", category=None),
+    SimpleNamespace(slug="topic_weaning", label="Weaning / Solids", category=None),
+    SimpleNamespace(slug="pref_blw", label="Baby-Led Weaning (BLW)", category=None),
+    SimpleNamespace(slug="topic_sleep", label="Sleep", category=None),
+    SimpleNamespace(slug="custom_steep", label="Steep", category=None),
+]
+
+
+@pytest.mark.parametrize(
+    "typo,expected",
+    [
+        ("ecxema", ["cond_eczema"]),
+        ("penut", ["allergy_peanut"]),
+        ("weening", ["topic_weaning", "pref_blw"]),
+        ("baby led weening", ["pref_blw"]),
+        ("peanut intor", ["allergy_peanut"]),
+    ],
+)
+def test_fuzzy_tier_finds_typos(typo, expected):
+    snap = SuggestSnapshot.build(FUZZY_ROWS, {"peanut intro": "allergy_peanut"})
+    assert _slugs(snap, typo) == expected
+
+
+def test_fuzzy_hits_rank_below_exact_hits():
+    snap = SuggestSnapshot.build(FUZZY_ROWS, {})
+    assert _slugs(snap, "sleep") == ["topic_sleep", "custom_steep"]
+    assert _slugs(snap, "sleep", limit=1) == ["topic_sleep"]
+
+
+def test_short_queries_are_not_fuzzy_matched():
+    snap = SuggestSnapshot.build(FUZZY_ROWS, {})
+    assert _slugs(snap, "egz") == []
+
+
+def test_category_filter():
+    rows = [
+        SimpleNamespace(slug="topic_sleep", label="Sleep", category="topic"),
+        SimpleNamespace(slug="custom_sleepsack", label="Sleep sack", category=None),
+        SimpleNamespace(slug="custom_steep", label="Steep", category="topic"),
+    ]
+    snap = SuggestSnapshot.build(rows, {})
+    assert _slugs(snap, "sleep") == ["topic_sleep", "custom_sleepsack", "custom_steep"]
+    assert [i["slug"] for i in snap.search("sleep", 8, "topic")] == ["topic_sleep", "custom_steep"]
+
+
+def test_new_custom_tags_rebuild_at_most_once_per_interval(monkeypatch):
+    snap = SuggestSnapshot.build(ROWS, syn._synonyms_map())
+    age = [5.0]
+    monkeypatch.setattr(suggest_index.builder, "age", lambda: age[0])
+    monkeypatch.setattr(suggest_index, "_custom_pending", False)
+    monkeypatch.setattr(tag_events, "listening", lambda: True)
+    monkeypatch.setattr(settings, "suggest_index_custom_rebuild_interval", 60.0)
+    monkeypatch.setattr(settings, "suggest_index_max_age", 60.0)
+
+    before = tag_events.version()
+    tag_events.tags_changed(custom_only=True)
+    assert tag_events.version() == before
+    assert not suggest_index._is_stale(snap)
+    age[0] = 61.0
+    assert suggest_index._is_stale(snap)
+
+    # Nothing pending and the listener is up: no periodic rebuild either
+    monkeypatch.setattr(suggest_index, "_custom_pending", False)
+    assert not suggest_index._is_stale(snap)
+    monkeypatch.setattr(tag_events, "listening", lambda: False)
+    assert suggest_index._is_stale(snap)
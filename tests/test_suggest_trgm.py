@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.services import tagging
+
+
+@pytest.fixture
+def trgm_index(db):
+    if db.execute(text("SELECT to_regclass('idx_tag_label_trgm')")).scalar() is None:
+        pytest.skip("pg_trgm index idx_tag_label_trgm is not installed")
+
+
+def _explain(db, stmt) -> str:
+    compiled = stmt.compile(dialect=db.bind.dialect)
+    rows = db.connection().exec_driver_sql("EXPLAIN " + str(compiled), compiled.params)
+    return "\n".join(r[0] for r in rows)
+
+
+@pytest.mark.usefixtures("ensure_seeded", "trgm_index")
+def test_trgm_suggest_plan_uses_gin_index(db):
+    # The seeded table is tiny, so disable seq scans to see whether the
+    # planner *can* answer the predicate from the trigram index.
+    db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = _explain(db, tagging._trgm_suggest_stmt("eczema", 8, [], []))
+    assert "idx_tag_label_trgm" in plan
+    assert "Limit" in plan
+
+
+@pytest.mark.usefixtures("ensure_seeded", "trgm_index")
+def test_trgm_suggest_ranking(db, monkeypatch):
+    monkeypatch.setattr(settings, "suggest_mode", "trgm")
+    labels = [s["label"].lower() for s in tagging.suggest_from_text(db, "ecz")]
+    assert labels and "eczema" in labels[0]
+
+    slugs = [s["slug"] for s in tagging.suggest_from_text(db, "sho")]
+    assert "topic_vaccines" in slugs
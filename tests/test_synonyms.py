@@ -1,7 +1,7 @@
 import pytest
 
 # Adjust import if your module path differs
-from app.services.synonyms import canonicalize, normalize
+from app.services.synonyms import candidate_slugs, canonicalize, normalize
 
 # --- Positive mappings (input -> expected canonical slug)
 CASES_POSITIVE = [
@@ -74,3 +74,16 @@ CASES_NEGATIVE = [
 @pytest.mark.parametrize("inp,expected", CASES_NEGATIVE)
 def test_canonicalize_negative(inp, expected):
     assert canonicalize(inp) is expected
+
+
+@pytest.mark.parametrize(
+    "inp,expected",
+    [
+        ("Sleep training", ("topic_sleep", "custom_sleeptraining")),
+        ("topic_naps", (None, "custom_topicnaps")),
+        ("custom", ("custom", "custom_custom")),
+        ("Unicorn allergy!", (None, "custom_unicornallergy")),
+    ],
+)
+def test_candidate_slugs(inp, expected):
+    assert candidate_slugs(inp) == expected
@@ -0,0 +1,104 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import suggest_index, tag_events, tagging
+from app.services import synonyms as syn
+
+
+@pytest.fixture
+def synonyms_file(tmp_path, monkeypatch):
+    path = tmp_path / "synonyms.json"
+    path.write_bytes(syn.SYNONYMS_PATH.read_bytes())
+    monkeypatch.setattr(syn, "SYNONYMS_PATH", path)
+    monkeypatch.setattr(syn, "_state", syn._state)
+    yield path
+    monkeypatch.undo()
+    tag_events.tags_changed()
+
+
+def _write(path, data, mtime_ns):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_reload_swaps_map_and_bumps_version(synonyms_file):
+    before = syn.state()
+    assert syn.reload() is False
+    data = json.loads(synonyms_file.read_text(encoding="utf-8"))
+    data["Zzz Time"] = "topic_sleep"
+    _write(synonyms_file, data, before.mtime_ns + 1_000_000)
+
+    assert syn.canonicalize("zzz time") is None
+    assert syn.reload() is True
+    assert syn.canonicalize("zzz   TIME") == "topic_sleep"
+    assert syn.version() == before.version + 1
+
+    # Same content under a new mtime keeps the map and its version
+    os.utime(synonyms_file, ns=(before.mtime_ns + 2_000_000,) * 2)
+    assert syn.reload() is False
+    assert syn.version() == before.version + 1
+
+
+def test_invalid_file_keeps_current_map(synonyms_file):
+    current = syn.state()
+    synonyms_file.write_text("{not json", encoding="utf-8")
+    with pytest.raises(ValueError):
+        syn.reload(force=True)
+    assert syn.state() is current
+
+
+def test_readers_never_see_a_partial_map(synonyms_file):
+    small = {"only key": "topic_sleep"}
+    full = json.loads(synonyms_file.read_text(encoding="utf-8"))
+    sizes = {len(small), len({syn.normalize(k) for k in full})}
+    seen = set()
+    stop = threading.Event()
+
+    def read():
+        while not stop.is_set():
+            seen.add(len(syn._synonyms_map()))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for i in range(20):
+        _write(synonyms_file, small if i % 2 == 0 else full, syn.state().mtime_ns + 1_000_000)
+        syn.reload()
+    stop.set()
+    reader.join()
+    assert seen <= sizes
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_suggest_uses_reloaded_synonyms(db, synonyms_file):
+    assert tagging.suggest_from_text(db, "qwerty nap") == []
+    data = json.loads(synonyms_file.read_text(encoding="utf-8"))
+    data["qwerty nap"] = "topic_naps"
+    _write(synonyms_file, data, syn.state().mtime_ns + 1_000_000)
+    syn.reload()
+    # The previous snapshot is served until the background rebuild lands
+    deadline = time.monotonic() + 10
+    while suggest_index.get_snapshot().synmap is not syn._synonyms_map() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert [s["slug"] for s in tagging.suggest_from_text(db, "qwerty nap")] == ["topic_naps"]
+
+
+def test_admin_reload_endpoint(synonyms_file, monkeypatch):
+    monkeypatch.setattr(settings, "admin_token", "s3cret")
+    client = TestClient(app)
+    url = "/api/v1/admin/synonyms/reload"
+    assert client.post(url).status_code == 403
+    resp = client.post(url, params={"force": True}, headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 200
+    assert resp.json()["changed"] is False
+    assert resp.json()["version"] == syn.version()
+
+    synonyms_file.write_text("[]", encoding="utf-8")
+    resp = client.post(url, params={"force": True}, headers={"X-Admin-Token": "s3cret"})
+    assert resp.status_code == 422
@@ -0,0 +1,161 @@
+import select
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from app.services import tag_events, tagging
+from app.services.tag_cache import TagCache, cache
+
+
+def _row(slug):
+    return SimpleNamespace(id=uuid.uuid4(), slug=slug, label=slug.title(), category=None)
+
+
+def test_lookups_by_slug_and_id():
+    tc = TagCache()
+    sleep = _row("topic_sleep")
+    tc.put([sleep, _row("custom_sleepsack")], tag_events.version())
+
+    found, missing = tc.get_slugs(["topic_sleep", "custom_sleepsack"])
+    assert list(found) == ["topic_sleep"] and missing == ["custom_sleepsack"]
+    found, missing = tc.get_ids([sleep.id])
+    assert found[sleep.id].slug == "topic_sleep" and missing == []
+    stats = tc.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+
+
+def test_rows_read_before_a_change_are_not_cached():
+    tc = TagCache()
+    version = tag_events.version()
+    tag_events.tags_changed()
+    tc.put([_row("topic_sleep")], version)
+    assert tc.get_slugs(["topic_sleep"])[1] == ["topic_sleep"]
+    assert tc.stats()["stale_puts"] == 1
+
+
+def test_tags_changed_clears_shared_cache():
+    cache.put([_row("topic_test")], tag_events.version())
+    tag_events.tags_changed()
+    assert cache.get_slugs(["topic_test"]) == ({}, ["topic_test"])
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_cached_resolve_skips_the_database(db, sql_statements):
+    ids = tagging.resolve_to_tag_ids(db, ["sleep", "eczema"])
+    sql_statements.clear()
+    assert tagging.resolve_to_tag_ids(db, ["Sleep", "atopic dermatitis"]) == ids
+    assert sql_statements == []
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_new_custom_tags_notify_after_commit(db, child, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tag_events, "_custom_subscribers", (lambda: calls.append("custom"),))
+    db.execute(text("SELECT 1"))  # caller-managed transaction
+    before = tag_events.version()
+    tagging.child_set_tags(db, child.id, [f"commit order {uuid.uuid4().hex[:8]}"])
+    assert calls == []
+    db.commit()
+    # Custom tags leave taxonomy-derived caches valid
+    assert calls == ["custom"]
+    assert tag_events.version() == before
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_savepoint_rollback_keeps_the_pending_notification(db, child, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tag_events, "_custom_subscribers", (lambda: calls.append("custom"),))
+    db.execute(text("SELECT 1"))  # caller-managed transaction
+    tagging.child_set_tags(db, child.id, [f"savepoint {uuid.uuid4().hex[:8]}"])
+    db.begin_nested().rollback()
+    db.commit()
+    assert calls == ["custom"]
+
+
+def test_custom_only_notifications_skip_full_invalidation(monkeypatch):
+    calls = []
+    monkeypatch.setattr(tag_events, "_subscribers", (lambda: calls.append("full"),))
+    monkeypatch.setattr(tag_events, "_custom_subscribers", (lambda: calls.append("custom"),))
+    before = tag_events.version()
+    tag_events._on_notify(f"{time.time()} custom")
+    assert calls == ["custom"] and tag_events.version() == before
+    tag_events._on_notify(f"{time.time()}")
+    assert calls == ["custom", "full"] and tag_events.version() == before + 1
+
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_catalog_commit_notifies_listener(engine):
+    with engine.connect() as conn:
+        if conn.execute(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = 'tag_catalog_changed'")
+        ).scalar() is None:
+            pytest.skip("tag_catalog_changed trigger is not installed")
+
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=tag_events.listen,
+        args=(lambda: engine.dialect.loaded_dbapi.connect(*cargs, **cparams), stop, 0.05),
+        daemon=True,
+    )
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while not tag_events.stats()["listener_connected"]:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+
+        before = tag_events.stats()["notifications"]
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE tag SET label = label WHERE slug = 'topic_sleep'"))
+        while tag_events.stats()["notifications"] == before:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        stats = tag_events.stats()
+        assert stats["last_lag_ms"] is not None and stats["last_lag_ms"] < 5000
+        print(f"\ninvalidation lag: {stats['last_lag_ms']:.2f}ms")
+    finally:
+        stop.set()
+        thread.join(timeout=5)
+
+
+def test_custom_tag_inserts_send_a_custom_payload(engine):
+    with engine.connect() as conn:
+        if conn.execute(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = 'tag_catalog_inserted'")
+        ).scalar() is None:
+            pytest.skip("tag_catalog_inserted trigger is not installed")
+
+    cargs, cparams = engine.dialect.create_connect_args(engine.url)
+    listener = engine.dialect.loaded_dbapi.connect(*cargs, **cparams)
+    listener.autocommit = True
+    slug = f"custom_trigger{uuid.uuid4().hex[:8]}"
+    try:
+        with listener.cursor() as cur:
+            cur.execute(f"LISTEN {tag_events.CHANNEL}")
+        with engine.begin() as conn:
+            conn.execute(
+                text("INSERT INTO tag (id, slug, label, active) VALUES (:id, :slug, 'Trigger', true)"),
+                {"id": uuid.uuid4(), "slug": slug},
+            )
+        with engine.begin() as conn:
+            conn.execute(text("UPDATE tag SET label = 'Trigger 2' WHERE slug = :slug"), {"slug": slug})
+
+        payloads = []
+        deadline = time.monotonic() + 5
+        while len(payloads) < 2:
+            assert time.monotonic() < deadline
+            select.select([listener], [], [], 0.05)
+            listener.poll()
+            payloads += [n.payload for n in listener.notifies]
+            listener.notifies.clear()
+        assert payloads[0].endswith(" custom")
+        assert " " not in payloads[1]
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM tag WHERE slug = :slug"), {"slug": slug})
+        listener.close()
@@ -0,0 +1,133 @@
+import sys
+from types import SimpleNamespace
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import suggest_index, tag_extract
+from app.services.tag_extract import ExtractAutomaton
+
+ROWS = [
+    SimpleNamespace(slug="cond_eczema", label="Eczema", category="condition"),
+    SimpleNamespace(slug="topic_naps", label="Naps", category="topic"),
+    SimpleNamespace(slug="topic_weaning", label="Weaning / Solids", category="topic"),
+    SimpleNamespace(slug="pref_blw", label="Baby-Led Weaning (BLW)", category="preference"),
+    SimpleNamespace(slug="allergy_peanut", label="Peanut", category="allergy"),
+    SimpleNamespace(slug="custom_naptime", label="Naptime", category=None),
+]
+SYNONYMS = {
+    "baby led weaning": "pref_blw",
+    "weaning": "topic_weaning",
+    "peanut intro": "allergy_peanut",
+    "atopic dermatitis": "cond_eczema",
+    "unknown key": "topic_missing",
+}
+
+
+def _automaton(rows=ROWS, synmap=SYNONYMS):
+    return ExtractAutomaton.build(*tag_extract._patterns(rows, synmap))
+
+
+def _found(text):
+    return [(slug, text[start:end]) for start, end, slug in _automaton().find(text)]
+
+
+def test_leftmost_longest_wins():
+    text = "We did baby-led weaning, then more weaning and a peanut intro."
+    assert _found(text) == [
+        ("pref_blw", "baby-led weaning"),
+        ("topic_weaning", "weaning"),
+        ("allergy_peanut", "peanut intro"),
+    ]
+
+
+def test_matches_stop_at_word_boundaries():
+    assert _found("naptime, unnaps and nap") == []
+    assert _found("Two NAPS today.") == [("topic_naps", "NAPS")]
+
+
+def test_custom_tags_and_unknown_synonyms_are_not_patterns():
+    patterns, tags = tag_extract._patterns(ROWS, SYNONYMS)
+    assert "custom_naptime" not in tags
+    assert ("unknown", "key") not in patterns
+    assert patterns[("baby", "led", "weaning", "blw")] == "pref_blw"
+
+
+def test_spans_follow_the_original_text():
+    text = "İstanbul trip:\tatopic\ndermatitis flared — eczema again"
+    found = _automaton().find(text)
+    assert [(text[s:e], slug) for s, e, slug in found] == [
+        ("atopic\ndermatitis", "cond_eczema"),
+        ("eczema", "cond_eczema"),
+    ]
+
+
+def test_every_unicode_space_separates_words():
+    for space in (c for c in map(chr, range(sys.maxunicode + 1)) if c.isspace()):
+        text = f"{space}no{space}{space}peanut{space}intro, peanut"
+        assert _found(text) == [
+            ("allergy_peanut", f"peanut{space}intro"),
+            ("allergy_peanut", "peanut"),
+        ], repr(space)
+
+
+def test_extract_lists_each_tag_once():
+    result = tag_extract.extract(_automaton(), "eczema, eczema and naps")
+    assert result["tags"] == [
+        {"slug": "cond_eczema", "label": "Eczema", "category": "condition"},
+        {"slug": "topic_naps", "label": "Naps", "category": "topic"},
+    ]
+    assert [m["start"] for m in result["matches"]] == [0, 8, 19]
+
+
+def test_automaton_survives_catalog_rebuilds(monkeypatch):
+    catalogs = iter(
+        [
+            ROWS,
+            # custom tag churn: same patterns
+            ROWS + [SimpleNamespace(slug="custom_x", label="X", category=None)],
+            ROWS[:-2],
+        ]
+    )
+    monkeypatch.setattr(tag_extract, "_taxonomy_rows", lambda: next(catalogs))
+    monkeypatch.setattr(tag_extract.syn, "_synonyms_map", lambda: SYNONYMS)
+    monkeypatch.setattr(tag_extract, "_automaton", None)
+    monkeypatch.setattr(tag_extract.builder, "_published", None)
+    first = tag_extract.builder.refresh()
+    assert tag_extract.builder.refresh() is first
+    third = tag_extract.builder.refresh()
+    assert third is not first
+    assert "allergy_peanut" not in third.tags
+    assert tag_extract.get_automaton() is third
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_extract_endpoint():
+    text = "Rough night: eczema flare, then baby led weaning at lunch."
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/tags/extract", json={"text": text})
+    assert response.status_code == 200
+    payload = response.json()
+    slugs = [t["slug"] for t in payload["tags"]]
+    assert "cond_eczema" in slugs and "pref_blw" in slugs
+    for match in payload["matches"]:
+        assert text[match["start"] : match["end"]] == match["text"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_extract_does_not_need_the_suggest_index(monkeypatch):
+    def no_index():
+        raise AssertionError("suggest index built")
+
+    monkeypatch.setattr(settings, "suggest_mode", "trgm")
+    monkeypatch.setattr(suggest_index.builder, "_published", None)
+    monkeypatch.setattr(suggest_index.builder, "_build", no_index)
+    monkeypatch.setattr(tag_extract.builder, "_published", None)
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/tags/extract", json={"text": "eczema at night"})
+    assert response.status_code == 200
+    assert [t["slug"] for t in response.json()["tags"]] == ["cond_eczema"]
@@ -1,13 +1,14 @@
 import re
+
 import pytest
 from sqlalchemy import select
 
-# Adjust imports to your actual paths
-from app.models.tag import Tag
 from app.models.child import ChildProfile
+
+# Adjust imports to your actual paths
 from app.models.tag import Tag
 from app.services import tagging
-from app.services.synonyms import canonicalize
+
 
 def _get_child_tag_slugs(db, child_id):
     # Replace with ORM join if you have ChildTag model imported
@@ -78,15 +79,14 @@ def test_suggest_from_text_ranking(db):
 
 @pytest.mark.usefixtures("ensure_seeded")
 def test_transaction_rollback_on_failure(db, child, monkeypatch):
-    # Monkeypatch insert to raise after clearing existing tags to ensure rollback
-    original = tagging.resolve_to_tag_ids
+    # Pre-insert one tag so we can see if it gets wiped incorrectly
+    tagging.child_set_tags(db, child.id, ["sleep"])
 
+    # Make resolution blow up after the current set has been read
     def boom(*args, **kwargs):
         raise RuntimeError("kaboom")
 
-    monkeypatch.setattr(tagging, "resolve_to_tag_ids", boom)
-    # Pre-insert one tag so we can see if it gets wiped incorrectly
-    tagging.child_set_tags(db, child.id, ["sleep"])
+    monkeypatch.setattr(tagging, "_resolve_tags", boom)
 
     with pytest.raises(RuntimeError):
         tagging.child_set_tags(db, child.id, ["eczema"])  # should rollback entirely
@@ -94,5 +94,196 @@ def test_transaction_rollback_on_failure(db, child, monkeypatch):
     # Original tag set should still be intact (no partial changes)
     assert _get_child_tag_slugs(db, child.id) == ["topic_sleep"]
 
-    # restore (not strictly needed due to function scope)
-    monkeypatch.setattr(tagging, "resolve_to_tag_ids", original)
+@pytest.mark.usefixtures("ensure_seeded")
+def test_suggest_from_text_tolerates_typos(db):
+    assert tagging.suggest_from_text(db, "ecxema")[0]["slug"] == "cond_eczema"
+    assert tagging.suggest_from_text(db, "penut")[0]["slug"] == "allergy_peanut"
+    assert "topic_weaning" in [s["slug"] for s in tagging.suggest_from_text(db, "weening")]
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_resolve_round_trips_do_not_grow_with_input_size(db, sql_statements):
+    counts = {}
+    for size in (3, 30, 120):
+        inputs = ["sleep", "eczema"] + [f"bench custom {size} {i}" for i in range(size - 2)]
+        sql_statements.clear()
+        ids = tagging.resolve_to_tag_ids(db, inputs)
+        counts[size] = len(sql_statements)
+        assert len(ids) == size
+
+        # Second pass finds every tag with a single SELECT
+        sql_statements.clear()
+        assert tagging.resolve_to_tag_ids(db, inputs) == ids
+        assert len(sql_statements) == 1
+    # one SELECT for candidate slugs + one INSERT ... RETURNING for new customs
+    assert set(counts.values()) == {2}, counts
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_resolve_preserves_input_order_and_dedup(db):
+    ids = tagging.resolve_to_tag_ids(
+        db, ["eczema", "Moonbeam Allergy", "  ", "sleep", "moonbeam allergy", "Atopic dermatitis"]
+    )
+    slugs = [db.execute(select(Tag.slug).where(Tag.id == i)).scalar_one() for i in ids]
+    assert slugs == ["cond_eczema", "custom_moonbeamallergy", "topic_sleep"]
+    label = db.execute(select(Tag.label).where(Tag.id == ids[1])).scalar_one()
+    assert label == "Moonbeam Allergy"
+    assert tagging.resolve_to_tag_ids(db, ["eczema", "never seen"], allow_custom=False) == [ids[0]]
+
+_WRITE_RE = re.compile(r"^\s*(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_child_set_tags_writes_only_the_delta(db, child, sql_statements):
+    tagging.child_set_tags(db, child.id, ["sleep", "eczema", "unicorn allergy"])
+
+    # Re-saving the same set (in any spelling/order) writes nothing: no DML
+    # and no DDL, just the current-set and slug lookups
+    sql_statements.clear()
+    out = tagging.child_set_tags(db, child.id, ["Eczema", "unicorn allergy", "sleep training"])
+    assert [s for s in sql_statements if _WRITE_RE.match(s)] == []
+    assert [s.split()[0].upper() for s in sql_statements if "SAVEPOINT" not in s] == [
+        "SELECT",
+        "SELECT",
+    ]
+    assert [o["slug"] for o in out] == ["cond_eczema", "custom_unicornallergy", "topic_sleep"]
+
+    # Swapping one tag deletes one pair, inserts one pair and bumps the
+    # child's updated_at
+    sql_statements.clear()
+    tagging.child_set_tags(db, child.id, ["sleep", "eczema", "peanut"])
+    writes = [s.split()[0].upper() for s in sql_statements if _WRITE_RE.match(s)]
+    assert sorted(writes) == ["DELETE", "INSERT", "UPDATE"]
+    assert _get_child_tag_slugs(db, child.id) == ["allergy_peanut", "cond_eczema", "topic_sleep"]
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_children_get_tags_round_trips_are_constant(db, sql_statements):
+    kids = [ChildProfile(user_id="u_bulk", name=f"k{i}") for i in range(20)]
+    db.add_all(kids)
+    db.flush()
+    for kid in kids[:10]:
+        tagging.child_set_tags(db, kid.id, ["sleep", "eczema", "unicorn allergy"])
+
+    sql_statements.clear()
+    out = tagging.children_get_tags(db, [k.id for k in kids])
+    # child/tag pairs + one lookup for the uncached custom tag
+    assert len(sql_statements) == 2
+    assert set(out) == {k.id for k in kids}
+    assert sorted(t["slug"] for t in out[kids[0].id][1]) == [
+        "cond_eczema", "custom_unicornallergy", "topic_sleep"
+    ]
+    assert out[kids[-1].id][1] == []
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_owned_child_tags_checks_ownership_in_one_statement(db, child, sql_statements):
+    import uuid
+
+    tagging.child_set_tags(db, child.id, ["sleep", "eczema", "unicorn allergy"])
+
+    sql_statements.clear()
+    owned, tags = tagging.owned_child_tags(db, child.id, "u_test")
+    assert len(sql_statements) == 1
+    assert owned is True
+    assert [t["slug"] for t in tags] == ["cond_eczema", "custom_unicornallergy", "topic_sleep"]
+    assert tags[0] == {"slug": "cond_eczema", "label": "Eczema", "category": None}
+
+    # Another user learns only that the child exists; no tags are returned
+    assert tagging.owned_child_tags(db, child.id, "u_other") == (False, [])
+    assert tagging.owned_child_tags(db, uuid.uuid4(), "u_test") is None
+
+    tagging.child_set_tags(db, child.id, [])
+    assert tagging.owned_child_tags(db, child.id, "u_test") == (True, [])
+
+@pytest.mark.usefixtures("ensure_seeded")
+def test_children_set_tags_resolves_once_and_writes_in_bulk(db, sql_statements):
+    kids = [ChildProfile(user_id="u_bulk", name=f"k{i}") for i in range(30)]
+    db.add_all(kids)
+    db.flush()
+    tagging.child_set_tags(db, kids[0].id, ["naps"])
+
+    sql_statements.clear()
+    out = tagging.children_set_tags(
+        db, {k.id: ["sleep", "eczema", f"bulk custom {i % 3}"] for i, k in enumerate(kids)}
+    )
+    statements = [s.split()[0].upper() for s in sql_statements if "SAVEPOINT" not in s]
+    # current pairs, slug lookup, custom insert, then one DELETE, INSERT and
+    # updated_at UPDATE for all children
+    assert statements == ["SELECT", "SELECT", "INSERT", "DELETE", "INSERT", "UPDATE"]
+    assert [t["slug"] for t in out[kids[4].id]] == ["topic_sleep", "cond_eczema", "custom_bulkcustom1"]
+    assert _get_child_tag_slugs(db, kids[0].id) == ["cond_eczema", "custom_bulkcustom0", "topic_sleep"]
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_async_equivalents_share_the_sync_behaviour():
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.core.db import dispose_async_engine, get_async_engine
+
+    try:
+        async with AsyncSession(get_async_engine(), expire_on_commit=False) as adb:
+            kid = ChildProfile(user_id="u_async", name="Async")
+            adb.add(kid)
+            await adb.flush()
+            out = await tagging.child_set_tags_async(adb, kid.id, ["sleep", "Eczema", "sleep training"])
+            assert [o["slug"] for o in out] == ["topic_sleep", "cond_eczema"]
+            got = await tagging.child_get_tags_async(adb, kid.id)
+            assert sorted(t["slug"] for t in got) == ["cond_eczema", "topic_sleep"]
+            bulk = await tagging.children_get_tags_async(adb, [kid.id])
+            assert bulk[kid.id][0] == kid.user_id
+            assert len(await tagging.resolve_to_tag_ids_async(adb, ["eczema", "naps"])) == 2
+            assert (await tagging.suggest_from_text_async(adb, "ecxema"))[0]["slug"] == "cond_eczema"
+            await adb.rollback()
+    finally:
+        await dispose_async_engine()
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_async_suggest_builds_a_cold_snapshot_off_the_event_loop(monkeypatch):
+    import threading
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.core.db import dispose_async_engine, get_async_engine
+    from app.services import suggest_index
+
+    threads = []
+    build = suggest_index.builder._build
+
+    def recording_build():
+        threads.append(threading.current_thread())
+        return build()
+
+    monkeypatch.setattr(suggest_index.builder, "_published", None)
+    monkeypatch.setattr(suggest_index.builder, "_build", recording_build)
+    monkeypatch.setattr(tagging.suggest_cache.cache, "get", lambda key: None)
+    try:
+        async with AsyncSession(get_async_engine()) as adb:
+            assert (await tagging.suggest_from_text_async(adb, "ecz"))[0]["slug"] == "cond_eczema"
+    finally:
+        await dispose_async_engine()
+    assert threads and threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_async_suggest_searches_off_the_event_loop(monkeypatch):
+    import threading
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from app.core.db import dispose_async_engine, get_async_engine
+    from app.services.suggest_index import SuggestSnapshot
+
+    threads = []
+    search = SuggestSnapshot.search
+
+    def recording_search(self, *args):
+        threads.append(threading.current_thread())
+        return search(self, *args)
+
+    monkeypatch.setattr(SuggestSnapshot, "search", recording_search)
+    monkeypatch.setattr(tagging.suggest_cache.cache, "get", lambda key: None)
+    try:
+        async with AsyncSession(get_async_engine()) as adb:
+            assert (await tagging.suggest_from_text_async(adb, "eczema"))[0]["slug"] == "cond_eczema"
+            assert (await tagging.suggest_batch_async(adb, [("sleep", 8, None)]))[0]
+    finally:
+        await dispose_async_engine()
+    assert len(threads) == 2 and threading.main_thread() not in threads
@@ -1,5 +1,9 @@
+import uuid
+
 import pytest
 from httpx import AsyncClient
+
+from app.api.v1.tags import MAX_BULK_READ_CHILDREN
 from app.main import app
 
 
@@ -81,6 +85,51 @@ async def test_missing_header_is_unauthorized(db_event_loop):
         assert r.status_code == 401
 
 
+@pytest.mark.asyncio
+async def test_bulk_get_children_tags(db_event_loop):
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        cids = []
+        for name in ("Cal", "Dee"):
+            r = await ac.post("/api/v1/children", headers={"X-User-Id": "u1"}, json={"name": name})
+            cids.append(r.json()["id"])
+        await ac.put(
+            f"/api/v1/children/{cids[0]}/tags",
+            headers={"X-User-Id": "u1"},
+            json={"tags": ["eczema", "unicorn allergy"]},
+        )
+
+        r = await ac.get(
+            "/api/v1/children/tags",
+            params={"ids": f"{cids[1]},{cids[0]}"},
+            headers={"X-User-Id": "u1"},
+        )
+        assert r.status_code == 200
+        children = r.json()["children"]
+        assert [c["child_id"] for c in children] == [cids[1], cids[0]]
+        assert children[0]["tags"] == []
+        assert sorted(t["slug"] for t in children[1]["tags"]) == [
+            "cond_eczema",
+            "custom_unicornallergy",
+        ]
+
+        r = await ac.get(
+            "/api/v1/children/tags", params={"ids": cids}, headers={"X-User-Id": "u2"}
+        )
+        assert r.status_code == 403
+        r = await ac.get(
+            "/api/v1/children/tags",
+            params={"ids": [cids[0], "00000000-0000-0000-0000-000000000000"]},
+            headers={"X-User-Id": "u1"},
+        )
+        assert r.status_code == 404
+        r = await ac.get(
+            "/api/v1/children/tags",
+            params={"ids": ",".join(str(uuid.uuid4()) for _ in range(MAX_BULK_READ_CHILDREN + 1))},
+            headers={"X-User-Id": "u1"},
+        )
+        assert r.status_code == 422 and r.json()["detail"] == "too_many_children"
+
+
 # Local event loop fixture for httpx AsyncClient
 import asyncio
 
@@ -47,3 +47,26 @@ async def test_suggest_limits_and_validation():
         capped = await ac.get("/api/v1/tags/suggest", params={"q": "ecz", "limit": 50})
     assert capped.status_code == 200
     assert len(capped.json()["results"]) <= 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("ensure_seeded")
+async def test_suggest_batch_matches_single_suggest():
+    queries = [{"q": "ecz", "limit": 3}, {"q": "sho"}, {"q": "x"}]
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/tags/suggest:batch", json={"queries": queries})
+        single = await ac.get("/api/v1/tags/suggest", params={"q": "sho"})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["query"] for r in results] == ["ecz", "sho", "x"]
+    assert "eczema" in results[0]["results"][0]["label"].lower()
+    assert len(results[0]["results"]) <= 3
+    assert results[1]["results"] == single.json()["results"]
+    assert results[2] == {"query": "x", "error": "invalid_query"}
+
+
+@pytest.mark.asyncio
+async def test_suggest_batch_validation():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        empty = await ac.post("/api/v1/tags/suggest:batch", json={"queries": []})
+    assert empty.status_code == 422
@@ -0,0 +1,75 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.services import synonyms as syn
+from app.services import taxonomy_artifact
+from app.services.suggest_index import SuggestSnapshot
+from app.services.taxonomy_artifact import SynonymTable
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def artifact_path(tmp_path):
+    path = tmp_path / "taxonomy.bin"
+    subprocess.run(
+        [sys.executable, str(REPO_ROOT / "scripts" / "build_taxonomy.py"), "-o", str(path)],
+        check=True,
+        capture_output=True,
+    )
+    return path
+
+
+def _synonyms():
+    return syn.parse(syn.SYNONYMS_PATH.read_bytes(), syn.SYNONYMS_PATH)
+
+
+def test_tables_match_the_json_source(artifact_path):
+    artifact = taxonomy_artifact.load(artifact_path)
+    expected = _synonyms()
+    assert isinstance(artifact.synonyms, SynonymTable)
+    assert dict(artifact.synonyms.items()) == expected
+    assert list(artifact.synonyms) == sorted(expected)
+    assert artifact.synonyms["baby led weaning"] == "pref_blw"
+    assert artifact.synonyms.get("unicorn allergy") is None
+    assert "naps" in artifact.synonyms and 3 not in artifact.synonyms
+    with pytest.raises(KeyError):
+        artifact.synonyms["unicorn allergy"]
+
+
+def test_synonym_hits_match_the_snapshot(artifact_path):
+    table = taxonomy_artifact.load(artifact_path).synonyms
+    snapshot = SuggestSnapshot.build((), _synonyms())
+    queries = {key[i:j] for key in table for i in range(len(key)) for j in range(i + 2, len(key) + 1)}
+    for qn in queries | {"zz", "sleep x"}:
+        assert table.synonym_hits(qn) == snapshot.synonym_hits(qn), qn
+
+
+def test_unreadable_artifacts_are_ignored(tmp_path, artifact_path):
+    assert taxonomy_artifact.load(tmp_path / "missing.bin") is None
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"JSON" + artifact_path.read_bytes()[4:])
+    assert taxonomy_artifact.load(bad) is None
+    bad.write_bytes(artifact_path.read_bytes()[:100])
+    assert taxonomy_artifact.load(bad) is None
+
+
+def test_synonyms_use_the_artifact_only_for_the_file_it_was_built_from(
+    tmp_path, artifact_path, monkeypatch
+):
+    monkeypatch.setattr(taxonomy_artifact, "ARTIFACT_PATH", artifact_path)
+    state = syn._read(syn.SYNONYMS_PATH, 1)
+    assert isinstance(state.mapping, SynonymTable)
+    assert state.mapping == _synonyms()
+
+    edited = tmp_path / "synonyms.json"
+    data = json.loads(syn.SYNONYMS_PATH.read_text(encoding="utf-8"))
+    data["Zzz Time"] = "topic_sleep"
+    edited.write_text(json.dumps(data), encoding="utf-8")
+    state = syn._read(edited, 2)
+    assert isinstance(state.mapping, dict)
+    assert state.mapping["zzz time"] == "topic_sleep"